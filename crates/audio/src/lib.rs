@@ -18,3 +18,9 @@ pub use audioin::*;
 
 mod audioout;
 pub use audioout::*;
+
+mod pcm;
+pub use pcm::*;
+
+mod resample;
+pub use resample::*;
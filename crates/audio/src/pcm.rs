@@ -0,0 +1,79 @@
+/// Convert an integer sample of `bits` bits to 16 bits, keeping the most significant ones.
+pub fn int_to_i16(sample: i32, bits: u32) -> i16 {
+    if bits >= 16 {
+        (sample >> (bits - 16)) as i16
+    } else {
+        (sample << (16 - bits)) as i16
+    }
+}
+
+/// Mono samples from an interleaved sample stream, averaging the channels of each frame.
+///
+/// A truncated last frame is averaged over the samples it has.
+pub struct MonoSamples<I> {
+    samples: I,
+    channels: usize,
+}
+
+impl<I> MonoSamples<I> {
+    pub fn new(samples: I, channels: usize) -> Self {
+        Self { samples, channels }
+    }
+}
+
+impl<E, I: Iterator<Item = Result<i16, E>>> Iterator for MonoSamples<I> {
+    type Item = Result<i16, E>;
+
+    fn next(&mut self) -> Option<Self::Item> {
+        let mut sum = 0i32;
+        let mut count = 0i32;
+        for _ in 0..self.channels {
+            match self.samples.next() {
+                Some(Ok(sample)) => sum += sample as i32,
+                Some(Err(e)) => return Some(Err(e)),
+                None => break,
+            }
+            count += 1;
+        }
+        if count == 0 {
+            return None;
+        }
+        Some(Ok((sum / count) as i16))
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_int_to_i16() {
+        assert_eq!(int_to_i16(-32768, 16), i16::MIN);
+        assert_eq!(int_to_i16(12345, 16), 12345);
+        assert_eq!(int_to_i16(0x7fffff, 24), i16::MAX);
+        assert_eq!(int_to_i16(-0x800000, 24), i16::MIN);
+        assert_eq!(int_to_i16(i32::MIN, 32), i16::MIN);
+        assert_eq!(int_to_i16(-128, 8), i16::MIN);
+        assert_eq!(int_to_i16(127, 8), 127 << 8);
+    }
+
+    #[test]
+    fn test_mono_samples() {
+        let stereo = [100i16, 200, -50, -150, 7, 9];
+        let mono: Result<Vec<i16>, ()> =
+            MonoSamples::new(stereo.iter().map(|&s| Ok(s)), 2).collect();
+        assert_eq!(mono, Ok(vec![150, -100, 8]));
+
+        let passthrough: Result<Vec<i16>, ()> =
+            MonoSamples::new(stereo.iter().map(|&s| Ok(s)), 1).collect();
+        assert_eq!(passthrough, Ok(stereo.to_vec()));
+    }
+
+    #[test]
+    fn test_mono_samples_truncated_frame() {
+        let stereo = [100i16, 200, -300];
+        let mono: Result<Vec<i16>, ()> =
+            MonoSamples::new(stereo.iter().map(|&s| Ok(s)), 2).collect();
+        assert_eq!(mono, Ok(vec![150, -300]));
+    }
+}
@@ -0,0 +1,237 @@
+// number of sinc zero crossings on each side of the filter center
+const ZERO_CROSSINGS: usize = 10;
+
+// filter cutoff relative to the lower Nyquist rate, leaves room for the transition band
+const ROLLOFF: f64 = 0.9;
+
+fn gcd(a: usize, b: usize) -> usize {
+    if b == 0 { a } else { gcd(b, a % b) }
+}
+
+/// Design the polyphase anti-aliasing filter for `up`/`down` resampling.
+///
+/// Returns the filter split into `up` phases of `taps` coefficients each, so
+/// every output sample is a single dot product against the input.
+fn polyphase_filter(up: usize, down: usize) -> (Vec<f32>, usize, usize) {
+    let max_ratio = up.max(down);
+    let half_len = ZERO_CROSSINGS * max_ratio;
+    let len = 2 * half_len + 1;
+    let cutoff = ROLLOFF / max_ratio as f64; // in units of the upsampled Nyquist rate
+
+    let mut h: Vec<f64> = (0..len)
+        .map(|i| {
+            let x = i as f64 - half_len as f64;
+            let sinc = if x == 0.0 {
+                1.0
+            } else {
+                let arg = std::f64::consts::PI * cutoff * x;
+                arg.sin() / arg
+            };
+            // Blackman window
+            let phase = 2.0 * std::f64::consts::PI * i as f64 / (len - 1) as f64;
+            let window = 0.42 - 0.5 * phase.cos() + 0.08 * (2.0 * phase).cos();
+            sinc * window
+        })
+        .collect();
+
+    // unity DC gain after zero-stuffing by `up`
+    let sum: f64 = h.iter().sum();
+    for c in h.iter_mut() {
+        *c *= up as f64 / sum;
+    }
+
+    let taps = len.div_ceil(up);
+    let mut phases = vec![0.0f32; up * taps];
+    for (i, &c) in h.iter().enumerate() {
+        phases[(i % up) * taps + i / up] = c as f32;
+    }
+    (phases, taps, half_len)
+}
+
+/// Streaming polyphase windowed-sinc resampler.
+///
+/// Produces the same output as [`resample`] on the concatenated input, with
+/// only the filter's worth of input history kept between calls.
+pub struct Resampler {
+    up: usize,
+    down: usize,
+    phases: Vec<f32>,
+    taps: usize,
+    half_len: usize,
+    history: Vec<f32>, // input samples from absolute index `offset` on
+    offset: usize,
+    consumed: usize, // input samples received
+    produced: usize, // output samples emitted
+}
+
+impl Resampler {
+    pub fn new(from_rate: usize, to_rate: usize) -> Self {
+        let g = gcd(from_rate, to_rate);
+        let up = to_rate / g;
+        let down = from_rate / g;
+        let (phases, taps, half_len) = polyphase_filter(up, down);
+        Self {
+            up,
+            down,
+            phases,
+            taps,
+            half_len,
+            history: Vec::new(),
+            offset: 0,
+            consumed: 0,
+            produced: 0,
+        }
+    }
+
+    /// Input index the filter of output sample `n` is centered on.
+    fn center(&self, n: usize) -> usize {
+        (n * self.down + self.half_len) / self.up
+    }
+
+    fn output_sample(&self, n: usize) -> i16 {
+        // position of this output sample in the upsampled stream, shifted by the filter delay
+        let m = n * self.down + self.half_len;
+        let phase = &self.phases[(m % self.up) * self.taps..(m % self.up + 1) * self.taps];
+        let center = m / self.up;
+
+        // input index for tap j is center - j, anything past the input is zero
+        let j_start = (center + 1).saturating_sub(self.consumed);
+        let j_end = self.taps.min(center + 1);
+        let mut acc = 0.0f32;
+        for j in j_start..j_end {
+            acc += phase[j] * self.history[center - j - self.offset];
+        }
+        acc.round().clamp(i16::MIN as f32, i16::MAX as f32) as i16
+    }
+
+    /// Feed `samples` and return every output sample whose input is complete.
+    pub fn process(&mut self, samples: &[i16]) -> Vec<i16> {
+        if self.up == self.down {
+            return samples.to_vec();
+        }
+        self.history.extend(samples.iter().map(|&s| s as f32));
+        self.consumed += samples.len();
+
+        let mut output = Vec::with_capacity(samples.len() * self.up / self.down + 1);
+        while self.center(self.produced) < self.consumed {
+            output.push(self.output_sample(self.produced));
+            self.produced += 1;
+        }
+
+        // drop input the next output's filter no longer reaches
+        let keep_from = self.center(self.produced).saturating_sub(self.taps - 1);
+        if keep_from > self.offset {
+            let drop = (keep_from - self.offset).min(self.history.len());
+            self.history.drain(..drop);
+            self.offset += drop;
+        }
+        output
+    }
+
+    /// Return the remaining output, with the input zero-padded past its end, and reset.
+    pub fn flush(&mut self) -> Vec<i16> {
+        if self.up == self.down {
+            return Vec::new();
+        }
+        let out_len = (self.consumed * self.up).div_ceil(self.down);
+        let output = (self.produced..out_len)
+            .map(|n| self.output_sample(n))
+            .collect();
+        self.history.clear();
+        self.offset = 0;
+        self.consumed = 0;
+        self.produced = 0;
+        output
+    }
+}
+
+/// Resample `samples` from `from_rate` to `to_rate` with a polyphase windowed-sinc filter.
+///
+/// Equivalent to zero-stuffing by `up`, low-pass filtering and decimating by
+/// `down` (with `up/down` the reduced rate ratio), but only ever evaluates the
+/// filter taps that land on real input samples.
+pub fn resample(samples: &[i16], from_rate: usize, to_rate: usize) -> Vec<i16> {
+    if from_rate == to_rate || samples.is_empty() {
+        return samples.to_vec();
+    }
+    let mut resampler = Resampler::new(from_rate, to_rate);
+    let mut output = resampler.process(samples);
+    output.extend(resampler.flush());
+    output
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sine(freq: f64, rate: usize, len: usize, amplitude: f64) -> Vec<i16> {
+        (0..len)
+            .map(|i| {
+                let t = i as f64 / rate as f64;
+                (amplitude * (2.0 * std::f64::consts::PI * freq * t).sin()).round() as i16
+            })
+            .collect()
+    }
+
+    #[test]
+    fn test_streaming_matches_batch() {
+        let input = sine(440.0, 44100, 10000, 8000.0);
+        let batch = resample(&input, 44100, 16000);
+        for chunk_size in [1, 7, 441, 4410] {
+            let mut resampler = Resampler::new(44100, 16000);
+            let mut streamed = Vec::new();
+            for chunk in input.chunks(chunk_size) {
+                streamed.extend(resampler.process(chunk));
+            }
+            streamed.extend(resampler.flush());
+            assert_eq!(streamed, batch, "chunk size {chunk_size}");
+        }
+    }
+
+    #[test]
+    fn test_output_length() {
+        let input = vec![0i16; 44100];
+        assert_eq!(resample(&input, 44100, 16000).len(), 16000);
+        let input = vec![0i16; 48000];
+        assert_eq!(resample(&input, 48000, 16000).len(), 16000);
+        let input = vec![0i16; 1000];
+        assert_eq!(resample(&input, 48000, 16000).len(), 334); // rounded up
+    }
+
+    #[test]
+    fn test_equal_rates_pass_through() {
+        let input = sine(440.0, 16000, 1000, 8000.0);
+        assert_eq!(resample(&input, 16000, 16000), input);
+        let mut resampler = Resampler::new(16000, 16000);
+        assert_eq!(resampler.process(&input), input);
+        assert!(resampler.flush().is_empty());
+    }
+
+    #[test]
+    fn test_low_frequency_sine_preserved() {
+        let amplitude = 10000.0;
+        for from_rate in [44100, 48000] {
+            let input = sine(200.0, from_rate, from_rate, amplitude);
+            let output = resample(&input, from_rate, 16000);
+            let expected = sine(200.0, 16000, output.len(), amplitude);
+            // skip the edges, where the filter runs into the zero padding
+            let middle = 1000..output.len() - 1000;
+            let peak = output[middle.clone()]
+                .iter()
+                .map(|&s| (s as f64).abs())
+                .fold(0.0, f64::max);
+            assert!(
+                (peak - amplitude).abs() < 0.01 * amplitude,
+                "{from_rate} Hz: peak {peak}"
+            );
+            for i in middle {
+                assert!(
+                    (output[i] as f64 - expected[i] as f64).abs() < 0.01 * amplitude,
+                    "{from_rate} Hz: sample {i} is {}, expected {}",
+                    output[i],
+                    expected[i]
+                );
+            }
+        }
+    }
+}
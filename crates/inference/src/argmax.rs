@@ -0,0 +1,82 @@
+const LANES: usize = 8;
+
+/// Index of the largest value, the last one on ties, `None` when empty.
+///
+/// Keeps a running maximum per lane so the compare-and-select loop has no
+/// dependency between neighbouring elements and vectorizes, then reduces the
+/// lanes and scans the tail. This is what greedy decoding runs on every step,
+/// over the full vocabulary.
+pub(crate) fn argmax(values: &[f32]) -> Option<usize> {
+    if values.is_empty() {
+        return None;
+    }
+
+    let mut lane_max = [f32::NEG_INFINITY; LANES];
+    let mut lane_idx = [0usize; LANES];
+    let chunks = values.chunks_exact(LANES);
+    let tail = chunks.remainder();
+    for (c, chunk) in chunks.enumerate() {
+        for l in 0..LANES {
+            if chunk[l] >= lane_max[l] {
+                lane_max[l] = chunk[l];
+                lane_idx[l] = c * LANES + l;
+            }
+        }
+    }
+
+    let mut best = f32::NEG_INFINITY;
+    let mut best_idx = 0;
+    for l in 0..LANES {
+        if lane_max[l] > best || (lane_max[l] == best && lane_idx[l] > best_idx) {
+            best = lane_max[l];
+            best_idx = lane_idx[l];
+        }
+    }
+    let tail_start = values.len() - tail.len();
+    for (i, &value) in tail.iter().enumerate() {
+        if value >= best {
+            best = value;
+            best_idx = tail_start + i;
+        }
+    }
+    Some(best_idx)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn reference(values: &[f32]) -> Option<usize> {
+        values
+            .iter()
+            .enumerate()
+            .max_by(|(_, a), (_, b)| a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal))
+            .map(|(idx, _)| idx)
+    }
+
+    #[test]
+    fn test_argmax_matches_max_by() {
+        let mut seed = 12345u32;
+        for len in [1, 7, 8, 9, 1025, 4096] {
+            let values: Vec<f32> = (0..len)
+                .map(|_| {
+                    seed = seed.wrapping_mul(1_664_525).wrapping_add(1_013_904_223);
+                    // few distinct values, so ties are common
+                    ((seed >> 24) % 16) as f32 - 8.0
+                })
+                .collect();
+            assert_eq!(argmax(&values), reference(&values), "len {len}");
+        }
+    }
+
+    #[test]
+    fn test_argmax_last_on_ties() {
+        assert_eq!(argmax(&[1.0; 20]), Some(19));
+        assert_eq!(argmax(&[0.0, 3.0, 1.0, 3.0, 2.0]), Some(3));
+    }
+
+    #[test]
+    fn test_argmax_empty() {
+        assert_eq!(argmax(&[]), None);
+    }
+}
@@ -7,7 +7,10 @@ use {
 };
 
 const PARAKEET_ENCODER_PATH: &str = "data/asr/parakeet/encoder.onnx";
+const PARAKEET_ENCODER_INT8_PATH: &str = "data/asr/parakeet/encoder.int8.onnx"; // int8 MatMul/Conv, optional, CPU only
+const PARAKEET_ENCODER_FP16_PATH: &str = "data/asr/parakeet/encoder.fp16.onnx"; // fp16 weights, fp32 IO, optional, CUDA only
 const PARAKEET_DECODER_PATH: &str = "data/asr/parakeet/decoder_joint.onnx";
+const PARAKEET_DECODER_INT8_PATH: &str = "data/asr/parakeet/decoder_joint.int8.onnx"; // int8 weights, optional, CPU only
 const PARAKEET_TOKENIZER_PATH: &str = "data/asr/parakeet/tokenizer.model";
 const MEL_FILTERBANK_PATH: &str = "data/asr/parakeet/mel_filterbank.bin";
 const HANN_WINDOW_PATH: &str = "data/asr/parakeet/hann_window.bin";
@@ -31,9 +34,13 @@ const LOG_ZERO_GUARD: f32 = 5.960_464_5e-08;
 
 const MAX_SYMBOLS_PER_STEP: usize = 16;
 
+const ENCODER_THREADS: usize = 4;
+const DECODER_THREADS: usize = 1; // tiny tensors, extra threads only add fork/join overhead per call
+
 const VOCAB_SIZE: usize = 1025; // 1024 tokens + 1 blank
 
 const TEXT_CHANNEL_CAPACITY: usize = 64;
+const ENCODER_WINDOW_CHANNEL_CAPACITY: usize = 2; // windows (or encoder outputs) queued ahead of the next stage
 
 // Fallback values if encoder metadata is missing
 const DEFAULT_ENCODER_WINDOW_SIZE: usize = 121;
@@ -44,157 +51,204 @@ fn zeros_f32(onnx: &Arc<onnx::Onnx>, shape: &[i64]) -> Result<onnx::Value, Infer
         .map_err(|e| InferError::Runtime(format!("Failed to create zero tensor: {e}")))
 }
 
-/// Convert audio samples to mel features, maintaining state across calls.
-///
-/// `audio_tail` holds leftover samples from the previous call that didn't form
-/// a complete frame. `prev_sample` provides pre-emphasis continuity.
+/// Recurrent model state that starts out as zero tensors.
 ///
-/// Returns new feature frames in frames-first layout `[T, 128]`.
-fn audio_to_features(
-    audio: &[i16],
-    mel_filterbank: &[f32],
-    hann_window: &[f32],
-    audio_tail: &mut Vec<i16>,
-    prev_sample: &mut i16,
-) -> Vec<f32> {
-    // Splice tail from previous call with new audio
-    let combined_len = audio_tail.len() + audio.len();
-    if combined_len < WINDOW_SIZE {
-        // Not enough samples for even one frame — just accumulate
-        audio_tail.extend_from_slice(audio);
-        if let Some(&last) = audio.last() {
-            *prev_sample = last;
+/// Every run replaces the state with the tensors the session produced. The
+/// zero tensors are allocated once, so a reset just falls back to them.
+struct RecurrentState<const N: usize> {
+    initial: [onnx::Value; N],
+    current: Option<[onnx::Value; N]>,
+}
+
+impl<const N: usize> RecurrentState<N> {
+    fn new(initial: [onnx::Value; N]) -> Self {
+        Self {
+            initial,
+            current: None,
         }
-        return Vec::new();
     }
 
-    // Build the combined signal with pre-emphasis applied continuously
-    let mut signal = Vec::with_capacity(combined_len);
-    let mut prev = *prev_sample as f32 / 32768.0;
-    for &s in audio_tail.iter().chain(audio.iter()) {
-        let cur = s as f32 / 32768.0;
-        signal.push(cur - PRE_EMPHASIS * prev);
-        prev = cur;
+    fn values(&self) -> &[onnx::Value; N] {
+        self.current.as_ref().unwrap_or(&self.initial)
     }
 
-    let num_frames = (signal.len() - WINDOW_SIZE) / HOP_SIZE + 1;
-    if num_frames == 0 {
-        audio_tail.extend_from_slice(audio);
-        if let Some(&last) = audio.last() {
-            *prev_sample = last;
+    fn update(&mut self, values: [onnx::Value; N]) {
+        self.current = Some(values);
+    }
+
+    fn reset(&mut self) {
+        self.current = None;
+    }
+}
+
+/// Streaming audio to mel feature converter.
+///
+/// Owns the fixed DSP tables, the state carried across calls and the scratch
+/// buffers reused for every frame, so steady-state operation does not allocate.
+struct FeatureExtractor {
+    mel_filterbank: Vec<f32>,
+    mel_bands: Vec<(usize, usize)>,
+    hann_window: Vec<f32>,
+    fft: fft::Fft,
+    signal: Vec<f32>, // pre-emphasized samples not yet consumed by a frame
+    prev_sample: i16, // pre-emphasis continuity
+    fft_re: Vec<f32>,
+    fft_im: Vec<f32>,
+    power_spectrum: Vec<f32>,
+}
+
+impl FeatureExtractor {
+    fn new(mel_filterbank: Vec<f32>, hann_window: Vec<f32>) -> Self {
+        let mel_bands = mel_filter_bands(&mel_filterbank);
+        Self {
+            mel_filterbank,
+            mel_bands,
+            hann_window,
+            fft: fft::Fft::new(FFT_SIZE),
+            signal: Vec::new(),
+            prev_sample: 0,
+            fft_re: vec![0.0; FFT_SIZE / 2],
+            fft_im: vec![0.0; FFT_SIZE / 2],
+            power_spectrum: vec![0.0; SPECTRUM_BINS],
         }
-        return Vec::new();
     }
 
-    // Compute mel features in frames-first layout [T, 128]
-    let mut features = vec![0.0f32; num_frames * NUM_MEL_BINS];
-    for frame_idx in 0..num_frames {
-        let start = frame_idx * HOP_SIZE;
-        let mut windowed = vec![0.0f32; FFT_SIZE];
-        for i in 0..WINDOW_SIZE {
-            windowed[i] = signal[start + i] * hann_window[i];
+    /// Clear the streaming state for the next utterance.
+    fn reset(&mut self) {
+        self.signal.clear();
+        self.prev_sample = 0;
+    }
+
+    /// Convert audio samples to mel features, maintaining state across calls.
+    ///
+    /// New feature frames are appended to `features` in frames-first layout
+    /// `[T, 128]`. Returns the number of frames appended.
+    fn process(&mut self, audio: &[i16], features: &mut Vec<f32>) -> usize {
+        // Convert and pre-emphasize the new audio in one pass, continuing the
+        // leftover signal from the previous call
+        let mut prev = self.prev_sample as f32 / 32768.0;
+        self.signal.extend(audio.iter().map(|&s| {
+            let cur = s as f32 / 32768.0;
+            let emphasized = cur - PRE_EMPHASIS * prev;
+            prev = cur;
+            emphasized
+        }));
+        if let Some(&last) = audio.last() {
+            self.prev_sample = last;
         }
-        let mut power_spectrum = vec![0.0f32; SPECTRUM_BINS];
-        for k in 0..SPECTRUM_BINS {
-            let mut r = 0.0f32;
-            let mut im = 0.0f32;
-            for (t, &sample) in windowed.iter().enumerate() {
-                let angle = -2.0 * std::f32::consts::PI * k as f32 * t as f32 / FFT_SIZE as f32;
-                r += sample * angle.cos();
-                im += sample * angle.sin();
-            }
-            power_spectrum[k] = r * r + im * im;
+
+        if self.signal.len() < WINDOW_SIZE {
+            // Not enough samples for even one frame — just accumulate
+            return 0;
         }
-        let frame_offset = frame_idx * NUM_MEL_BINS;
-        for bin_idx in 0..NUM_MEL_BINS {
-            let fb_offset = bin_idx * SPECTRUM_BINS;
-            let mut mel_energy = 0.0f32;
-            for k in 0..SPECTRUM_BINS {
-                mel_energy += mel_filterbank[fb_offset + k] * power_spectrum[k];
+        let num_frames = (self.signal.len() - WINDOW_SIZE) / HOP_SIZE + 1;
+
+        // Compute mel features in frames-first layout [T, 128]
+        let features_start = features.len();
+        features.resize(features_start + num_frames * NUM_MEL_BINS, 0.0);
+        for frame_idx in 0..num_frames {
+            let start = frame_idx * HOP_SIZE;
+            self.fft.windowed_power_spectrum(
+                &self.signal[start..start + WINDOW_SIZE],
+                &self.hann_window,
+                &mut self.fft_re,
+                &mut self.fft_im,
+                &mut self.power_spectrum,
+            );
+            let frame_offset = features_start + frame_idx * NUM_MEL_BINS;
+            for (bin_idx, &(band_start, band_end)) in self.mel_bands.iter().enumerate() {
+                let fb_offset = bin_idx * SPECTRUM_BINS;
+                let mut mel_energy = 0.0f32;
+                for k in band_start..band_end {
+                    mel_energy += self.mel_filterbank[fb_offset + k] * self.power_spectrum[k];
+                }
+                features[frame_offset + bin_idx] = (mel_energy + LOG_ZERO_GUARD).ln();
             }
-            features[frame_offset + bin_idx] = (mel_energy + LOG_ZERO_GUARD).ln();
         }
-    }
 
-    // Save unconsumed samples as the new tail
-    let consumed_samples = (num_frames - 1) * HOP_SIZE + WINDOW_SIZE;
-    audio_tail.clear();
-    // Rebuild tail from the original i16 sources
-    let tail_start = consumed_samples;
-    if tail_start < combined_len {
-        let old_len = audio_tail.len(); // 0 after clear
-        let _ = old_len; // suppress warning
-        let audio_tail_start = audio.len() as isize - (combined_len - tail_start) as isize;
-        if audio_tail_start < 0 {
-            // Some tail samples come from the old audio_tail — but we cleared it.
-            // This shouldn't happen since consumed_samples <= combined_len and
-            // the old tail was prepended. Reconstruct from the chain.
-            // Actually we need the original samples. Let's just track the boundary.
-        }
-        // Simpler: since we consumed from the combined stream, the tail is the
-        // last (combined_len - consumed_samples) samples from audio (or spanning
-        // the old tail + audio boundary).
-        let remaining = combined_len - consumed_samples;
-        if remaining <= audio.len() {
-            audio_tail.extend_from_slice(&audio[audio.len() - remaining..]);
-        } else {
-            // This case means some tail samples were from the *previous* tail,
-            // which we already cleared. In practice this is very unlikely because
-            // we only enter this function with enough combined samples for >= 1 frame.
-            // If it does happen, we lose a few samples at the boundary — acceptable.
-            audio_tail.extend_from_slice(audio);
-        }
-    }
+        // Keep everything from the next frame start onward
+        self.signal.drain(..num_frames * HOP_SIZE);
 
-    if let Some(&last) = audio.last() {
-        *prev_sample = last;
+        num_frames
     }
+}
 
-    features
+/// Find the non-zero span `[start, end)` of each triangular mel filter.
+///
+/// The filterbank is stored dense `[128, 257]`, but each filter only covers a
+/// few spectrum bins, so applying it over its span skips the zero weights.
+fn mel_filter_bands(mel_filterbank: &[f32]) -> Vec<(usize, usize)> {
+    mel_filterbank
+        .chunks_exact(SPECTRUM_BINS)
+        .map(|filter| {
+            match (
+                filter.iter().position(|&w| w != 0.0),
+                filter.iter().rposition(|&w| w != 0.0),
+            ) {
+                (Some(start), Some(end)) => (start, end + 1),
+                _ => (0, 0),
+            }
+        })
+        .collect()
 }
 
 /// Transpose feature frames from frames-first `[T, 128]` to channels-first `[128, T]`.
-fn transpose_features(frames_first: &[f32], num_frames: usize) -> Vec<f32> {
-    let mut channels_first = vec![0.0f32; NUM_MEL_BINS * num_frames];
+fn transpose_features(frames_first: &[f32], num_frames: usize, channels_first: &mut [f32]) {
     for frame in 0..num_frames {
         for bin in 0..NUM_MEL_BINS {
             channels_first[bin * num_frames + frame] = frames_first[frame * NUM_MEL_BINS + bin];
         }
     }
-    channels_first
 }
 
+/// Bind the outputs a session produces on every run.
+///
+/// `host_outputs` are read back on the CPU, `device_outputs` are recurrent
+/// state that is only fed back into the next run, so it stays on the
+/// executor's device.
+fn bind_outputs(
+    binding: &mut onnx::IoBinding,
+    executor: &onnx::Executor,
+    host_outputs: &[&str],
+    device_outputs: &[&str],
+) -> Result<(), onnx::OnnxError> {
+    for name in host_outputs {
+        binding.bind_output_to_device(name, &onnx::Executor::Cpu)?;
+    }
+    for name in device_outputs {
+        binding.bind_output_to_device(name, executor)?;
+    }
+    Ok(())
+}
+
+/// Run the encoder on one window.
+///
+/// `audio_signal` is the channels-first `[1, 128, T]` window, `length` holds `T`.
 fn run_encoder(
-    onnx: &Arc<onnx::Onnx>,
     encoder: &mut onnx::Session,
-    features: &[f32],
-    num_frames: usize,
-    cache_last_channel: &mut onnx::Value,
-    cache_last_time: &mut onnx::Value,
-    cache_last_channel_len: &mut onnx::Value,
+    encoder_binding: &mut onnx::IoBinding,
+    audio_signal: &onnx::Value,
+    length: &onnx::Value,
+    encoder_cache: &mut RecurrentState<3>,
 ) -> Result<(Vec<f32>, usize), InferError> {
-    let audio_signal = onnx::Value::from_slice(&onnx, &[1, 128, num_frames], features)
-        .map_err(|e| InferError::Runtime(format!("error creating audio_signal: {e}")))?;
-    let length = onnx::Value::from_slice(&onnx, &[1], &[num_frames as i64])
-        .map_err(|e| InferError::Runtime(format!("error creating length: {e}")))?;
-    let mut outputs = encoder
-        .run(
-            &[
-                ("audio_signal", &audio_signal),
-                ("length", &length),
-                ("cache_last_channel", &cache_last_channel),
-                ("cache_last_time", &cache_last_time),
-                ("cache_last_channel_len", &cache_last_channel_len),
-            ],
-            &[
-                "outputs",
-                "encoded_lengths",
-                "cache_last_channel_next",
-                "cache_last_time_next",
-                "cache_last_channel_next_len",
-            ],
-        )
+    let [cache_last_channel, cache_last_time, cache_last_channel_len] = encoder_cache.values();
+    for (name, value) in [
+        ("audio_signal", audio_signal),
+        ("length", length),
+        ("cache_last_channel", cache_last_channel),
+        ("cache_last_time", cache_last_time),
+        ("cache_last_channel_len", cache_last_channel_len),
+    ] {
+        encoder_binding
+            .bind_input(name, value)
+            .map_err(|e| InferError::Runtime(format!("error binding {name}: {e}")))?;
+    }
+    encoder
+        .run_with_binding(encoder_binding)
         .map_err(|e| InferError::Runtime(format!("Encoder inference failed: {e}")))?;
+    let mut outputs = encoder_binding
+        .outputs()
+        .map_err(|e| InferError::Runtime(format!("error getting encoder outputs: {e}")))?;
 
     let encoder_out_shape = outputs[0]
         .tensor_shape()
@@ -204,94 +258,234 @@ fn run_encoder(
         .extract_as_f32()
         .map_err(|e| InferError::Runtime(format!("failed to extract encoder output: {e}")))?;
 
-    // update cache
-    *cache_last_channel = outputs.remove(2);
-    *cache_last_time = outputs.remove(2);
-    *cache_last_channel_len = outputs.remove(2);
+    // update cache, stays on the device
+    encoder_cache.update([outputs.remove(2), outputs.remove(2), outputs.remove(2)]);
 
     Ok((encoder_out_data, encoder_out_len))
 }
 
+/// Check whether decoder_joint accepts a variable number of encoder frames.
+fn decoder_has_dynamic_frames(decoder_joint: &onnx::Session) -> bool {
+    let count = decoder_joint.input_count().unwrap_or(0);
+    (0..count)
+        .find(|&i| {
+            decoder_joint
+                .input_name(i)
+                .is_ok_and(|name| name == "encoder_outputs")
+        })
+        .and_then(|i| decoder_joint.input_shape(i).ok())
+        .is_some_and(|shape| shape.get(2).is_some_and(|&frames| frames < 0))
+}
+
+/// decoder_joint inputs, allocated once for the decoder thread and rewritten
+/// in place before every run.
+///
+/// On the CPU executor the binding references their host memory, so they're
+/// bound once and encoder_outputs is only rebound when it's reallocated for a
+/// new number of frames. Other executors copy an input to the device when
+/// it's bound, so there every write is followed by a rebind.
+struct DecoderInputs {
+    encoder_outputs: onnx::Value,
+    encoder_outputs_frames: usize,
+    targets: onnx::Value,
+    _target_length: onnx::Value,
+    rebind: bool, // binding copied the inputs to the device, rebind after every write
+}
+
+impl DecoderInputs {
+    fn new(
+        onnx: &Arc<onnx::Onnx>,
+        executor: &onnx::Executor,
+        decoder_binding: &mut onnx::IoBinding,
+    ) -> Result<Self, InferError> {
+        let encoder_outputs = zeros_f32(onnx, &[1, ENCODER_DIM as i64, 1])?;
+        let targets = onnx::Value::from_slice(onnx, &[1, 1], &[BLANK_ID as i32])
+            .map_err(|e| InferError::Runtime(format!("error creating targets: {e}")))?;
+        let target_length = onnx::Value::from_slice(onnx, &[1], &[1i32])
+            .map_err(|e| InferError::Runtime(format!("error creating target_length: {e}")))?;
+        for (name, value) in [
+            ("encoder_outputs", &encoder_outputs),
+            ("targets", &targets),
+            ("target_length", &target_length),
+        ] {
+            decoder_binding
+                .bind_input(name, value)
+                .map_err(|e| InferError::Runtime(format!("error binding {name}: {e}")))?;
+        }
+        Ok(Self {
+            encoder_outputs,
+            encoder_outputs_frames: 1,
+            targets,
+            _target_length: target_length,
+            rebind: !matches!(executor, onnx::Executor::Cpu),
+        })
+    }
+
+    /// Channels-first `[1024, num_frames]` encoder_outputs buffer to fill.
+    ///
+    /// Call `encoder_outputs_filled` once it holds the frames to score.
+    fn encoder_outputs(
+        &mut self,
+        onnx: &Arc<onnx::Onnx>,
+        decoder_binding: &mut onnx::IoBinding,
+        num_frames: usize,
+    ) -> Result<&mut [f32], InferError> {
+        if self.encoder_outputs_frames != num_frames {
+            self.encoder_outputs = zeros_f32(onnx, &[1, ENCODER_DIM as i64, num_frames as i64])?;
+            self.encoder_outputs_frames = num_frames;
+            // with `rebind`, it gets bound once filled
+            if !self.rebind {
+                decoder_binding
+                    .bind_input("encoder_outputs", &self.encoder_outputs)
+                    .map_err(|e| {
+                        InferError::Runtime(format!("error binding encoder_outputs: {e}"))
+                    })?;
+            }
+        }
+        Ok(self.encoder_outputs.as_slice_mut::<f32>())
+    }
+
+    fn encoder_outputs_filled(
+        &mut self,
+        decoder_binding: &mut onnx::IoBinding,
+    ) -> Result<(), InferError> {
+        if self.rebind {
+            decoder_binding
+                .bind_input("encoder_outputs", &self.encoder_outputs)
+                .map_err(|e| InferError::Runtime(format!("error binding encoder_outputs: {e}")))?;
+        }
+        Ok(())
+    }
+
+    fn set_target(
+        &mut self,
+        decoder_binding: &mut onnx::IoBinding,
+        token: i64,
+    ) -> Result<(), InferError> {
+        self.targets.as_slice_mut::<i32>()[0] = token as i32;
+        if self.rebind {
+            decoder_binding
+                .bind_input("targets", &self.targets)
+                .map_err(|e| InferError::Runtime(format!("error binding targets: {e}")))?;
+        }
+        Ok(())
+    }
+}
+
+/// RNN-T greedy decode of one encoder chunk.
+///
+/// As long as no token is emitted the decoder state doesn't change, so the
+/// joint output of every remaining frame only depends on that frame. With
+/// `batch_frames`, all remaining frames are scored in one decoder_joint call
+/// and the run restarts from the first frame that emits a token, which takes
+/// one call per emitted symbol (plus one) instead of one call per frame and
+/// symbol. Without it (fixed-size model input), frames are scored one by one.
+/// Emitted tokens are appended to `token_ids`.
 fn greedy_decode(
     onnx: &Arc<onnx::Onnx>,
     decoder_joint: &mut onnx::Session,
+    decoder_binding: &mut onnx::IoBinding,
+    decoder_inputs: &mut DecoderInputs,
+    batch_frames: bool,
     encoder_out: &[f32],
     encoder_out_len: usize,
-    cache_state1: &mut onnx::Value,
-    cache_state2: &mut onnx::Value,
+    decoder_state: &mut RecurrentState<2>,
     cache_last_token: &mut i64,
-) -> Result<Vec<i64>, InferError> {
-    let mut token_ids = Vec::new();
-    let mut encoder_frame = vec![0.0f32; ENCODER_DIM];
-    for frame_idx in 0..encoder_out_len {
-        for d in 0..ENCODER_DIM {
-            encoder_frame[d] = encoder_out[d * encoder_out_len + frame_idx];
+    token_ids: &mut Vec<i64>,
+) -> Result<(), InferError> {
+    let mut frame_idx = 0;
+    let mut frame_symbols = 0;
+
+    // the decoder state only changes when a token is emitted, so it is only
+    // rebound then; a blank just leaves the previous binding in place
+    let mut states_changed = true;
+
+    // scoring frame by frame reads one column of the channels-first encoder output per call,
+    // transposed once to frames-first every frame becomes a contiguous copy
+    let frames_first = (!batch_frames && encoder_out_len > 0).then(|| {
+        let mut frames_first = vec![0.0f32; encoder_out_len * ENCODER_DIM];
+        for (d, row) in encoder_out.chunks_exact(encoder_out_len).enumerate() {
+            for (t, &value) in row.iter().enumerate() {
+                frames_first[t * ENCODER_DIM + d] = value;
+            }
         }
-        let encoder_outputs = onnx::Value::from_slice(&onnx, &[1, ENCODER_DIM, 1], &encoder_frame)
-            .map_err(|e| InferError::Runtime(format!("error creating encoder_outputs: {e}")))?;
-
-        for _ in 0..MAX_SYMBOLS_PER_STEP {
-            let state1_data = cache_state1
-                .extract_tensor::<f32>()
-                .map_err(|e| InferError::Runtime(format!("error extracting state1: {e}")))?
-                .to_vec();
-            let state2_data = cache_state2
-                .extract_tensor::<f32>()
-                .map_err(|e| InferError::Runtime(format!("error extracting state2: {e}")))?
-                .to_vec();
-            let targets = onnx::Value::from_slice(&onnx, &[1, 1], &[*cache_last_token as i32])
-                .map_err(|e| InferError::Runtime(format!("error creating targets: {e}")))?;
-            let target_length = onnx::Value::from_slice(&onnx, &[1], &[1i32])
-                .map_err(|e| InferError::Runtime(format!("error creating target_length: {e}")))?;
-            let mut outputs = decoder_joint
-                .run(
-                    &[
-                        ("encoder_outputs", &encoder_outputs),
-                        ("targets", &targets),
-                        ("target_length", &target_length),
-                        ("input_states_1", &cache_state1),
-                        ("input_states_2", &cache_state2),
-                    ],
-                    &[
-                        "outputs",
-                        "prednet_lengths",
-                        "output_states_1",
-                        "output_states_2",
-                    ],
-                )
-                .map_err(|e| InferError::Runtime(format!("decoder_joint inference failed: {e}")))?;
-            let logits = outputs[0]
-                .extract_tensor::<f32>()
-                .map_err(|e| InferError::Runtime(format!("error extracting logits: {e}")))?
-                .to_vec();
-
-            *cache_state1 = outputs.remove(2);
-            *cache_state2 = outputs.remove(2);
-
-            let valid_range = &logits[..VOCAB_SIZE.min(logits.len())];
-            let predicted_token_id = valid_range
-                .iter()
-                .enumerate()
-                .max_by(|(_, a), (_, b)| a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal))
-                .map(|(idx, _)| idx as i64)
-                .unwrap_or(0);
-
-            if predicted_token_id == BLANK_ID {
-                *cache_state1 =
-                    onnx::Value::from_slice(&onnx, &[2, 1, DECODER_STATE_DIM], &state1_data)
-                        .map_err(|e| InferError::Runtime(format!("error restoring state1: {e}")))?;
-                *cache_state2 =
-                    onnx::Value::from_slice(&onnx, &[2, 1, DECODER_STATE_DIM], &state2_data)
-                        .map_err(|e| InferError::Runtime(format!("error restoring state2: {e}")))?;
+        frames_first
+    });
+    while frame_idx < encoder_out_len {
+        let end = if batch_frames {
+            encoder_out_len
+        } else {
+            frame_idx + 1
+        };
+        let num_frames = end - frame_idx;
+        let frames = decoder_inputs.encoder_outputs(onnx, decoder_binding, num_frames)?;
+        match &frames_first {
+            Some(frames_first) => frames.copy_from_slice(
+                &frames_first[frame_idx * ENCODER_DIM..(frame_idx + 1) * ENCODER_DIM],
+            ),
+            None => {
+                for d in 0..ENCODER_DIM {
+                    let row = d * encoder_out_len;
+                    frames[d * num_frames..(d + 1) * num_frames]
+                        .copy_from_slice(&encoder_out[row + frame_idx..row + end]);
+                }
+            }
+        }
+        decoder_inputs.encoder_outputs_filled(decoder_binding)?;
+        decoder_inputs.set_target(decoder_binding, *cache_last_token)?;
+        if states_changed {
+            let [state1, state2] = decoder_state.values();
+            for (name, value) in [("input_states_1", state1), ("input_states_2", state2)] {
+                decoder_binding
+                    .bind_input(name, value)
+                    .map_err(|e| InferError::Runtime(format!("error binding {name}: {e}")))?;
+            }
+            states_changed = false;
+        }
+        decoder_joint
+            .run_with_binding(decoder_binding)
+            .map_err(|e| InferError::Runtime(format!("decoder_joint inference failed: {e}")))?;
+        let mut outputs = decoder_binding.outputs().map_err(|e| {
+            InferError::Runtime(format!("error getting decoder_joint outputs: {e}"))
+        })?;
+
+        // logits are [1, T, U + 1, VOCAB_SIZE], only u = 0 is used
+        let logits = outputs[0]
+            .extract_tensor::<f32>()
+            .map_err(|e| InferError::Runtime(format!("error extracting logits: {e}")))?;
+        let frame_stride = logits.len() / num_frames;
+        let vocab = VOCAB_SIZE.min(frame_stride);
+        let mut emitted = None;
+        for t in 0..num_frames {
+            let token_id = argmax::argmax(&logits[t * frame_stride..t * frame_stride + vocab])
+                .unwrap_or(0) as i64;
+            if token_id != BLANK_ID {
+                emitted = Some((t, token_id));
                 break;
             }
+            // blank advances to the next frame
+            frame_symbols = 0;
+        }
 
-            token_ids.push(predicted_token_id);
-            *cache_last_token = predicted_token_id;
+        match emitted {
+            // every frame was blank, the decoder state stays as it was
+            None => frame_idx = end,
+            Some((t, token_id)) => {
+                frame_idx += t;
+                token_ids.push(token_id);
+                *cache_last_token = token_id;
+                decoder_state.update([outputs.remove(2), outputs.remove(2)]);
+                states_changed = true;
+                frame_symbols += 1;
+                if frame_symbols >= MAX_SYMBOLS_PER_STEP {
+                    frame_idx += 1;
+                    frame_symbols = 0;
+                }
+            }
         }
     }
 
-    Ok(token_ids)
+    Ok(())
 }
 
 enum ParakeetCommand<T: Clone + Send + 'static> {
@@ -299,6 +493,29 @@ enum ParakeetCommand<T: Clone + Send + 'static> {
     Flush { payload: T },
 }
 
+enum EncoderCommand<T: Clone + Send + 'static> {
+    Window {
+        audio_signal: onnx::Value, // channels-first [1, 128, window_size]
+        payload: T,
+        is_flush: bool,
+    },
+    Flush {
+        payload: T,
+    },
+}
+
+enum DecoderCommand<T: Clone + Send + 'static> {
+    Frames {
+        encoder_out: Vec<f32>, // [1024, encoder_out_len]
+        encoder_out_len: usize,
+        payload: T,
+        is_flush: bool,
+    },
+    Flush {
+        payload: T,
+    },
+}
+
 pub struct ParakeetHandle<T: Clone + Send + 'static> {
     input_tx: std_mpsc::Sender<ParakeetCommand<T>>,
 }
@@ -307,27 +524,149 @@ pub struct ParakeetListener<T: Clone + Send + 'static> {
     output_rx: tokio_mpsc::Receiver<AsrOutput<T>>,
 }
 
+/// Create the session for one of the parakeet models.
+///
+/// On the CPU the graph-optimized model is cached next to the original as
+/// `*.opt.onnx` and loaded with optimizations disabled, so the graph fusions
+/// only run again when the model file changes. If the cache can't be written
+/// or loaded, the original model is loaded and optimized as on the other
+/// executors.
+///
+/// Intra-op threads don't spin waiting for more work after a run. Each stage
+/// runs its session once per window or symbol while the other stages keep
+/// the remaining cores busy, so spinning would only take cycles from them.
+fn create_session(
+    onnx: &Arc<onnx::Onnx>,
+    executor: &onnx::Executor,
+    name: &str,
+    model_path: &str,
+    threads: usize,
+) -> Result<onnx::Session, InferError> {
+    let config_entries = [("session.intra_op.allow_spinning", "0")];
+    if let onnx::Executor::Cpu = executor {
+        // the cache is only an optimization, any trouble with it falls back to the original model
+        let optimized_path = std::path::Path::new(model_path).with_extension("opt.onnx");
+        let modified = |path: &std::path::Path| std::fs::metadata(path).and_then(|m| m.modified());
+        let is_stale = match (modified(model_path.as_ref()), modified(&optimized_path)) {
+            (Ok(model), Ok(optimized)) => optimized < model,
+            _ => true,
+        };
+        let saved = if is_stale {
+            log_info!(
+                "optimizing {} into {}",
+                model_path,
+                optimized_path.display()
+            );
+            onnx.save_optimized_model(
+                &onnx::OptimizationLevel::EnableAll,
+                model_path,
+                &optimized_path,
+            )
+        } else {
+            Ok(())
+        };
+        let session = saved.and_then(|_| {
+            onnx.create_session_with_config(
+                executor,
+                &onnx::OptimizationLevel::Disabled,
+                threads,
+                &config_entries,
+                &optimized_path,
+            )
+        });
+        match session {
+            Ok(session) => return Ok(session),
+            Err(e) => {
+                log_warn!(
+                    "optimized {name} model {} unusable, loading {model_path}: {e}",
+                    optimized_path.display()
+                );
+                // don't keep a partial write around, the next start tries again
+                let _ = std::fs::remove_file(&optimized_path);
+            }
+        }
+    }
+    onnx.create_session_with_config(
+        executor,
+        &onnx::OptimizationLevel::EnableAll,
+        threads,
+        &config_entries,
+        model_path,
+    )
+    .map_err(|e| InferError::Runtime(format!("Failed to create {name} session: {e}")))
+}
+
 pub fn create<T: Clone + Send + 'static>(
     onnx: &Arc<onnx::Onnx>,
     executor: &onnx::Executor,
 ) -> Result<(ParakeetHandle<T>, ParakeetListener<T>), InferError> {
-    // create encoder and decoder_joint sessions
-    let mut encoder = onnx
-        .create_session(
-            executor,
-            &onnx::OptimizationLevel::EnableAll,
-            4,
-            PARAKEET_ENCODER_PATH,
-        )
-        .map_err(|e| InferError::Runtime(format!("Failed to create encoder session: {e}")))?;
-    let mut decoder_joint = onnx
-        .create_session(
-            executor,
-            &onnx::OptimizationLevel::EnableAll,
-            4,
-            PARAKEET_DECODER_PATH,
-        )
-        .map_err(|e| InferError::Runtime(format!("Failed to create decoder_joint session: {e}")))?;
+    // without the cuda feature the GPU executors run on the CPU, pick models for that
+    let executor = &executor.resolve();
+
+    // create encoder and decoder_joint sessions; prefer the encoder variant that fits the executor
+    // when it was exported: int8 on the CPU (the GPU executors have no int8 kernels for it and
+    // would fall back to the CPU), fp16 on CUDA for the tensor cores (TensorRT already builds
+    // fp16 engines from the fp32 model)
+    let preferred_encoder_path = match executor {
+        onnx::Executor::Cpu => Some(PARAKEET_ENCODER_INT8_PATH),
+        onnx::Executor::Cuda(_) => Some(PARAKEET_ENCODER_FP16_PATH),
+        onnx::Executor::TensorRt(_) => None,
+    };
+    let encoder_path = preferred_encoder_path
+        .filter(|path| std::path::Path::new(path).exists())
+        .unwrap_or(PARAKEET_ENCODER_PATH);
+    log_info!("parakeet encoder: {}", encoder_path);
+    let mut encoder = create_session(onnx, executor, "encoder", encoder_path, ENCODER_THREADS)?;
+    // likewise the quantized decoder_joint, on the CPU only
+    let use_int8_decoder = matches!(executor, onnx::Executor::Cpu)
+        && std::path::Path::new(PARAKEET_DECODER_INT8_PATH).exists();
+    let decoder_path = if use_int8_decoder {
+        PARAKEET_DECODER_INT8_PATH
+    } else {
+        PARAKEET_DECODER_PATH
+    };
+    log_info!("parakeet decoder_joint: {}", decoder_path);
+    // decoder_joint stays on CUDA under TensorRT: the batched decoder runs it with a different
+    // number of frames almost every time, and each new shape would build another engine
+    let decoder_executor = match executor {
+        onnx::Executor::TensorRt(id) => onnx::Executor::Cuda(*id),
+        executor => executor.clone(),
+    };
+    let mut decoder_joint = create_session(
+        onnx,
+        &decoder_executor,
+        "decoder_joint",
+        decoder_path,
+        DECODER_THREADS,
+    )?;
+    let batch_decoder_frames = decoder_has_dynamic_frames(&decoder_joint);
+    log_info!("decoder_joint batched frames: {}", batch_decoder_frames);
+
+    // bind outputs once, recurrent state stays on the executor's device between runs
+    let mut encoder_binding = encoder
+        .create_io_binding()
+        .map_err(|e| InferError::Runtime(format!("Failed to create encoder binding: {e}")))?;
+    bind_outputs(
+        &mut encoder_binding,
+        executor,
+        &["outputs", "encoded_lengths"],
+        &[
+            "cache_last_channel_next",
+            "cache_last_time_next",
+            "cache_last_channel_next_len",
+        ],
+    )
+    .map_err(|e| InferError::Runtime(format!("Failed to bind encoder outputs: {e}")))?;
+    let mut decoder_binding = decoder_joint
+        .create_io_binding()
+        .map_err(|e| InferError::Runtime(format!("Failed to create decoder_joint binding: {e}")))?;
+    bind_outputs(
+        &mut decoder_binding,
+        &decoder_executor,
+        &["outputs", "prednet_lengths"],
+        &["output_states_1", "output_states_2"],
+    )
+    .map_err(|e| InferError::Runtime(format!("Failed to bind decoder_joint outputs: {e}")))?;
 
     // read streaming parameters from encoder metadata
     let metadata = encoder.metadata().unwrap_or_default();
@@ -376,27 +715,106 @@ pub fn create<T: Clone + Send + 'static>(
         )));
     }
 
-    // load tokenizer
-    let tokenizer_tokens = load_tokens(&PARAKEET_TOKENIZER_PATH)?;
+    // load tokenizer, with the SentencePiece word marker already turned into a space
+    let tokenizer_tokens: Vec<String> = load_tokens(&PARAKEET_TOKENIZER_PATH)?
+        .into_iter()
+        .map(|token| token.replace('▁', " "))
+        .collect();
 
     // create channels
     let (input_tx, input_rx) = std_mpsc::channel::<ParakeetCommand<T>>();
+    let (window_tx, window_rx) =
+        std_mpsc::sync_channel::<EncoderCommand<T>>(ENCODER_WINDOW_CHANNEL_CAPACITY);
+    let (frames_tx, frames_rx) =
+        std_mpsc::sync_channel::<DecoderCommand<T>>(ENCODER_WINDOW_CHANNEL_CAPACITY);
     let (output_tx, output_rx) = tokio_mpsc::channel::<AsrOutput<T>>(TEXT_CHANNEL_CAPACITY);
 
-    // spawn processing task
+    // spawn feature task, prepares the next encoder window while the current one runs
     std::thread::spawn({
         let onnx = Arc::clone(&onnx);
         move || {
             // --- audio -> features state ---
-            let mut audio_tail: Vec<i16> = Vec::new();
-            let mut prev_sample: i16 = 0;
+            let mut feature_extractor = FeatureExtractor::new(mel_filterbank, hann_window);
 
             // --- feature rolling buffer (frames-first [T, 128]) ---
             let mut feat_buf: Vec<f32> = Vec::new();
             let mut feat_buf_frames: usize = 0;
 
+            while let Ok(command) = input_rx.recv() {
+                let (audio, payload, is_flush) = match command {
+                    ParakeetCommand::Audio(chunk) => (chunk.audio, chunk.payload, false),
+                    ParakeetCommand::Flush { payload } => (Vec::new(), payload, true),
+                };
+
+                // Level 1: audio -> feature frames (frames-first)
+                if !audio.is_empty() {
+                    feat_buf_frames += feature_extractor.process(&audio, &mut feat_buf);
+                }
+
+                // On flush: pad remaining features to encoder_window_size
+                if is_flush && feat_buf_frames > 0 && feat_buf_frames < encoder_window_size {
+                    let pad_frames = encoder_window_size - feat_buf_frames;
+                    feat_buf.resize(feat_buf.len() + pad_frames * NUM_MEL_BINS, 0.0);
+                    feat_buf_frames = encoder_window_size;
+                }
+
+                // Level 2: hand a window to the encoder whenever we have enough frames, walking
+                // the buffer by offset so the consumed frames are dropped with a single shift
+                let mut window_start = 0;
+                while feat_buf_frames - window_start >= encoder_window_size {
+                    // Extract window_size frames and transpose to channels-first, straight into
+                    // the encoder's input tensor
+                    let mut audio_signal = match zeros_f32(
+                        &onnx,
+                        &[1, NUM_MEL_BINS as i64, encoder_window_size as i64],
+                    ) {
+                        Ok(v) => v,
+                        Err(e) => {
+                            log_error!("error creating audio_signal: {e}");
+                            return;
+                        }
+                    };
+                    let start = window_start * NUM_MEL_BINS;
+                    let window_data = &feat_buf[start..start + encoder_window_size * NUM_MEL_BINS];
+                    transpose_features(
+                        window_data,
+                        encoder_window_size,
+                        audio_signal.as_slice_mut::<f32>(),
+                    );
+                    let window = EncoderCommand::Window {
+                        audio_signal,
+                        payload: payload.clone(),
+                        is_flush,
+                    };
+                    if window_tx.send(window).is_err() {
+                        return;
+                    }
+
+                    // Next window keeps the last `feat_overlap` frames, advances by chunk_shift
+                    window_start += encoder_chunk_shift.min(feat_buf_frames - window_start);
+                }
+                feat_buf.drain(..window_start * NUM_MEL_BINS);
+                feat_buf_frames -= window_start;
+
+                // After flush: pass the flush on and reset feature state
+                if is_flush {
+                    if window_tx.send(EncoderCommand::Flush { payload }).is_err() {
+                        return;
+                    }
+                    feature_extractor.reset();
+                    feat_buf.clear();
+                    feat_buf_frames = 0;
+                }
+            }
+        }
+    });
+
+    // spawn encoder task, runs the next window while the decoder works on the current one
+    std::thread::spawn({
+        let onnx = Arc::clone(&onnx);
+        move || {
             // --- encoder cache ---
-            let mut cache_last_channel = match zeros_f32(
+            let cache_last_channel = match zeros_f32(
                 &onnx,
                 &[
                     1,
@@ -411,7 +829,7 @@ pub fn create<T: Clone + Send + 'static>(
                     return;
                 }
             };
-            let mut cache_last_time = match zeros_f32(
+            let cache_last_time = match zeros_f32(
                 &onnx,
                 &[
                     1,
@@ -426,7 +844,7 @@ pub fn create<T: Clone + Send + 'static>(
                     return;
                 }
             };
-            let mut cache_last_channel_len = match onnx::Value::from_slice(&onnx, &[1], &[0i64]) {
+            let cache_last_channel_len = match onnx::Value::from_slice(&onnx, &[1], &[0i64]) {
                 Ok(v) => v,
                 Err(e) => {
                     log_error!("error creating cache_last_channel_len: {e}");
@@ -434,204 +852,199 @@ pub fn create<T: Clone + Send + 'static>(
                 }
             };
 
+            let mut encoder_cache =
+                RecurrentState::new([cache_last_channel, cache_last_time, cache_last_channel_len]);
+
+            // every window has the same number of frames
+            let length = match onnx::Value::from_slice(&onnx, &[1], &[encoder_window_size as i64]) {
+                Ok(v) => v,
+                Err(e) => {
+                    log_error!("error creating length: {e}");
+                    return;
+                }
+            };
+
+            // warm up on a zero window, so the first real window doesn't pay for kernel and
+            // algorithm selection and arena growth; the cache starts over afterwards
+            let warmup_signal =
+                match zeros_f32(&onnx, &[1, NUM_MEL_BINS as i64, encoder_window_size as i64]) {
+                    Ok(v) => v,
+                    Err(e) => {
+                        log_error!("error creating warmup audio_signal: {e}");
+                        return;
+                    }
+                };
+            if let Err(e) = run_encoder(
+                &mut encoder,
+                &mut encoder_binding,
+                &warmup_signal,
+                &length,
+                &mut encoder_cache,
+            ) {
+                log_error!("error warming up encoder: {e}");
+            }
+            encoder_cache.reset();
+
+            // main encoder loop
+            while let Ok(command) = window_rx.recv() {
+                match command {
+                    EncoderCommand::Window {
+                        audio_signal,
+                        payload,
+                        is_flush,
+                    } => {
+                        // Run encoder
+                        let (encoder_out, encoder_out_len) = match run_encoder(
+                            &mut encoder,
+                            &mut encoder_binding,
+                            &audio_signal,
+                            &length,
+                            &mut encoder_cache,
+                        ) {
+                            Ok(r) => r,
+                            Err(e) => {
+                                log_error!("error running encoder: {e}");
+                                continue;
+                            }
+                        };
+
+                        let frames = DecoderCommand::Frames {
+                            encoder_out,
+                            encoder_out_len,
+                            payload,
+                            is_flush,
+                        };
+                        if frames_tx.send(frames).is_err() {
+                            return;
+                        }
+                    }
+
+                    // After flush: pass the flush on and reset encoder state
+                    EncoderCommand::Flush { payload } => {
+                        if frames_tx.send(DecoderCommand::Flush { payload }).is_err() {
+                            return;
+                        }
+                        encoder_cache.reset();
+                    }
+                }
+            }
+        }
+    });
+
+    // spawn decoder task
+    std::thread::spawn({
+        let onnx = Arc::clone(&onnx);
+        move || {
             // --- decoder cache ---
-            let mut cache_state1 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
+            let cache_state1 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
                 Ok(v) => v,
                 Err(e) => {
                     log_error!("error creating state1: {e}");
                     return;
                 }
             };
-            let mut cache_state2 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
+            let cache_state2 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
                 Ok(v) => v,
                 Err(e) => {
                     log_error!("error creating state2: {e}");
                     return;
                 }
             };
-            let mut cache_last_token = BLANK_ID;
-
-            // main audio loop
-            while let Ok(command) = input_rx.recv() {
-                let (audio, payload, is_flush) = match command {
-                    ParakeetCommand::Audio(chunk) => (chunk.audio, chunk.payload, false),
-                    ParakeetCommand::Flush { payload } => (Vec::new(), payload, true),
-                };
-
-                // Level 1: audio -> feature frames (frames-first)
-                if !audio.is_empty() {
-                    let new_features = audio_to_features(
-                        &audio,
-                        &mel_filterbank,
-                        &hann_window,
-                        &mut audio_tail,
-                        &mut prev_sample,
-                    );
-                    let new_frames = new_features.len() / NUM_MEL_BINS;
-                    if new_frames > 0 {
-                        feat_buf.extend_from_slice(&new_features);
-                        feat_buf_frames += new_frames;
+            let mut decoder_state = RecurrentState::new([cache_state1, cache_state2]);
+            let mut decoder_inputs =
+                match DecoderInputs::new(&onnx, &decoder_executor, &mut decoder_binding) {
+                    Ok(v) => v,
+                    Err(e) => {
+                        log_error!("error creating decoder inputs: {e}");
+                        return;
                     }
-                }
-
-                // On flush: pad remaining features to encoder_window_size
-                if is_flush && feat_buf_frames > 0 && feat_buf_frames < encoder_window_size {
-                    let pad_frames = encoder_window_size - feat_buf_frames;
-                    feat_buf.resize(feat_buf.len() + pad_frames * NUM_MEL_BINS, 0.0);
-                    feat_buf_frames = encoder_window_size;
-                }
-
-                // Level 2: feed encoder whenever we have enough frames
-                while feat_buf_frames >= encoder_window_size {
-                    // Extract window_size frames and transpose to channels-first
-                    let window_data = &feat_buf[..encoder_window_size * NUM_MEL_BINS];
-                    let encoder_input = transpose_features(window_data, encoder_window_size);
+                };
+            let mut cache_last_token = BLANK_ID;
+            let mut token_ids = Vec::new(); // reused for every window
 
-                    // Run encoder
-                    let (encoder_out, encoder_out_len) = match run_encoder(
-                        &onnx,
-                        &mut encoder,
-                        &encoder_input,
-                        encoder_window_size,
-                        &mut cache_last_channel,
-                        &mut cache_last_time,
-                        &mut cache_last_channel_len,
-                    ) {
-                        Ok(r) => r,
-                        Err(e) => {
-                            log_error!("error running encoder: {e}");
-                            break;
-                        }
-                    };
+            // warm up decoder_joint on a zero frame, then start over from a blank
+            let warmup_frame = vec![0.0f32; ENCODER_DIM];
+            if let Err(e) = greedy_decode(
+                &onnx,
+                &mut decoder_joint,
+                &mut decoder_binding,
+                &mut decoder_inputs,
+                batch_decoder_frames,
+                &warmup_frame,
+                1,
+                &mut decoder_state,
+                &mut cache_last_token,
+                &mut token_ids,
+            ) {
+                log_error!("error warming up decoder_joint: {e}");
+            }
+            decoder_state.reset();
+            cache_last_token = BLANK_ID;
 
-                    // Greedy decode
-                    let token_ids = match greedy_decode(
-                        &onnx,
-                        &mut decoder_joint,
-                        &encoder_out,
+            // main decoder loop
+            while let Ok(command) = frames_rx.recv() {
+                match command {
+                    DecoderCommand::Frames {
+                        encoder_out,
                         encoder_out_len,
-                        &mut cache_state1,
-                        &mut cache_state2,
-                        &mut cache_last_token,
-                    ) {
-                        Ok(t) => t,
-                        Err(e) => {
+                        payload,
+                        is_flush,
+                    } => {
+                        // Greedy decode
+                        token_ids.clear();
+                        if let Err(e) = greedy_decode(
+                            &onnx,
+                            &mut decoder_joint,
+                            &mut decoder_binding,
+                            &mut decoder_inputs,
+                            batch_decoder_frames,
+                            &encoder_out,
+                            encoder_out_len,
+                            &mut decoder_state,
+                            &mut cache_last_token,
+                            &mut token_ids,
+                        ) {
                             log_error!("error decoding: {e}");
-                            break;
+                            continue;
                         }
-                    };
 
-                    let text = if !token_ids.is_empty() {
-                        token_ids
+                        let text = token_ids
                             .iter()
-                            .filter_map(|&id| {
-                                let idx = id as usize;
-                                if idx >= tokenizer_tokens.len() {
-                                    None
-                                } else {
-                                    Some(tokenizer_tokens[idx].replace('▁', " "))
-                                }
-                            })
-                            .collect::<String>()
-                    } else {
-                        String::new()
-                    };
+                            .filter_map(|&id| tokenizer_tokens.get(id as usize))
+                            .map(String::as_str)
+                            .collect::<String>();
+
+                        // only send non-flush outputs if they have text (reduces noise)
+                        let should_send = is_flush || !text.is_empty();
+                        if should_send {
+                            let output = AsrOutput::<T> {
+                                payload,
+                                text,
+                                is_flush: false, // per-window output, not the final flush
+                            };
+                            if let Err(e) = output_tx.blocking_send(output) {
+                                log_error!("error sending text: {e}");
+                                return;
+                            }
+                        }
+                    }
 
-                    // only send non-flush outputs if they have text (reduces noise)
-                    let should_send = is_flush || !text.is_empty();
-                    if should_send {
+                    // After flush: send the flush marker and reset decoder state
+                    DecoderCommand::Flush { payload } => {
                         let output = AsrOutput::<T> {
-                            payload: payload.clone(),
-                            text,
-                            is_flush: false, // per-window output, not the final flush
+                            payload,
+                            text: String::new(),
+                            is_flush: true,
                         };
                         if let Err(e) = output_tx.blocking_send(output) {
-                            log_error!("error sending text: {e}");
+                            log_error!("error sending flush marker: {e}");
                             return;
                         }
-                    }
-
-                    // Shift buffer: keep last `feat_overlap` frames, drop chunk_shift
-                    let shift_frames = encoder_chunk_shift.min(feat_buf_frames);
-                    let shift_floats = shift_frames * NUM_MEL_BINS;
-                    feat_buf.drain(..shift_floats);
-                    feat_buf_frames -= shift_frames;
-                }
 
-                // After flush: send the flush marker and reset all state
-                if is_flush {
-                    let output = AsrOutput::<T> {
-                        payload: payload.clone(),
-                        text: String::new(),
-                        is_flush: true,
-                    };
-                    if let Err(e) = output_tx.blocking_send(output) {
-                        log_error!("error sending flush marker: {e}");
-                        return;
+                        // Reset state for next utterance
+                        decoder_state.reset();
+                        cache_last_token = BLANK_ID;
                     }
-
-                    // Reset state for next utterance
-                    audio_tail.clear();
-                    prev_sample = 0;
-                    feat_buf.clear();
-                    feat_buf_frames = 0;
-                    cache_last_channel = match zeros_f32(
-                        &onnx,
-                        &[
-                            1,
-                            NUM_LAYERS as i64,
-                            CACHE_CHANNEL_CONTEXT as i64,
-                            ENCODER_DIM as i64,
-                        ],
-                    ) {
-                        Ok(v) => v,
-                        Err(e) => {
-                            log_error!("error resetting cache_last_channel: {e}");
-                            return;
-                        }
-                    };
-                    cache_last_time = match zeros_f32(
-                        &onnx,
-                        &[
-                            1,
-                            NUM_LAYERS as i64,
-                            ENCODER_DIM as i64,
-                            CACHE_TIME_CONTEXT as i64,
-                        ],
-                    ) {
-                        Ok(v) => v,
-                        Err(e) => {
-                            log_error!("error resetting cache_last_time: {e}");
-                            return;
-                        }
-                    };
-                    cache_last_channel_len = match onnx::Value::from_slice(&onnx, &[1], &[0i64]) {
-                        Ok(v) => v,
-                        Err(e) => {
-                            log_error!("error resetting cache_last_channel_len: {e}");
-                            return;
-                        }
-                    };
-                    cache_state1 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
-                        Ok(v) => v,
-                        Err(e) => {
-                            log_error!("error resetting state1: {e}");
-                            return;
-                        }
-                    };
-                    cache_state2 = match zeros_f32(&onnx, &[2, 1, DECODER_STATE_DIM as i64]) {
-                        Ok(v) => v,
-                        Err(e) => {
-                            log_error!("error resetting state2: {e}");
-                            return;
-                        }
-                    };
-                    cache_last_token = BLANK_ID;
-                }
-
-                // Skip sending output for non-flush commands with no new features
-                if !is_flush && audio.is_empty() {
-                    continue;
                 }
             }
         }
@@ -3,6 +3,16 @@ const PRED_SCORE_THRESHOLD: f32 = 0.25;
 const STRONG_BOOST_RATE: f32 = 0.75;
 const WEAK_BOOST_RATE: f32 = 1.5;
 
+/// Order (frame_idx, score) pairs by score descending, ties by frame.
+///
+/// Same order a stable descending sort gives, so partial selection picks the
+/// same frames as sorting everything.
+fn by_score_descending(a: &(usize, f32), b: &(usize, f32)) -> std::cmp::Ordering {
+    b.1.partial_cmp(&a.1)
+        .unwrap_or(std::cmp::Ordering::Equal)
+        .then(a.0.cmp(&b.0))
+}
+
 /// Compute log-likelihood ratio scores for each speaker per frame.
 ///
 /// Returns scores [num_frames * NUM_SPEAKERS] flattened.
@@ -55,23 +65,28 @@ pub(crate) fn boost_topk_scores(scores: &mut [f32], num_frames: usize) {
             continue;
         }
 
-        // Sort by score descending
-        spk_scores.sort_by(|a, b| b.1.partial_cmp(&a.1).unwrap_or(std::cmp::Ordering::Equal));
-
         let n_pos = spk_scores.len();
         let strong_k = ((n_pos as f32 * STRONG_BOOST_RATE) as usize).max(1);
         let weak_k = ((n_pos as f32 * WEAK_BOOST_RATE) as usize).max(1);
+        let strong_end = strong_k.min(n_pos);
+        let weak_end = weak_k.min(n_pos).max(strong_end);
+
+        // Partition instead of sorting, only the strong/weak split matters
+        if weak_end < n_pos {
+            spk_scores.select_nth_unstable_by(weak_end - 1, by_score_descending);
+        }
+        if strong_end < weak_end {
+            spk_scores[..weak_end].select_nth_unstable_by(strong_end - 1, by_score_descending);
+        }
 
         // Boost strong frames (top strong_k)
-        for i in 0..strong_k.min(spk_scores.len()) {
-            let frame_idx = spk_scores[i].0;
+        for &(frame_idx, _) in &spk_scores[..strong_end] {
             let idx = frame_idx * NUM_SPEAKERS + spk_idx;
             scores[idx] += 10.0; // Additive boost
         }
 
         // Boost weak frames (next weak_k)
-        for i in strong_k..weak_k.min(spk_scores.len()) {
-            let frame_idx = spk_scores[i].0;
+        for &(frame_idx, _) in &spk_scores[strong_end..weak_end] {
             let idx = frame_idx * NUM_SPEAKERS + spk_idx;
             scores[idx] += 5.0; // Smaller boost
         }
@@ -98,12 +113,16 @@ pub(crate) fn get_topk_indices(
             .filter(|(_, score)| score.is_finite())
             .collect();
 
-        // Sort by score descending
-        spk_scores.sort_by(|a, b| b.1.partial_cmp(&a.1).unwrap_or(std::cmp::Ordering::Equal));
-
         // Select top k_per_speaker frames
-        for i in 0..k_per_speaker.min(spk_scores.len()) {
-            selected.insert(spk_scores[i].0);
+        let k = k_per_speaker.min(spk_scores.len());
+        if k == 0 {
+            continue;
+        }
+        if k < spk_scores.len() {
+            spk_scores.select_nth_unstable_by(k - 1, by_score_descending);
+        }
+        for &(frame_idx, _) in &spk_scores[..k] {
+            selected.insert(frame_idx);
         }
     }
 
@@ -1,5 +1,5 @@
-use crate::InferError;
-use std::f32::consts::PI;
+use crate::{fft, mel, InferError};
+use std::{f32::consts::PI, sync::OnceLock};
 
 const SAMPLE_RATE: usize = 16000;
 const WINDOW_SIZE_MS: usize = 25;
@@ -9,6 +9,11 @@ const PRE_EMPHASIS: f32 = 0.97;
 const FFT_SIZE: usize = 512;
 const LOG_ZERO_GUARD: f32 = 5.96e-8;
 
+// Window and filterbank only depend on the constants above, build them once per process
+static HANN_WINDOW: OnceLock<Vec<f32>> = OnceLock::new();
+static MEL_FILTERBANK: OnceLock<mel::MelBands> = OnceLock::new();
+static FFT: OnceLock<fft::Fft> = OnceLock::new();
+
 // Mel scale conversion (HTK formula)
 fn hz_to_mel(hz: f32) -> f32 {
     2595.0 * (1.0 + hz / 700.0).log10()
@@ -46,20 +51,27 @@ pub fn compute_mel_features(audio: &[f32], sample_rate: usize) -> Result<(Vec<f3
         )));
     }
 
-    // Apply pre-emphasis (input is already f32 in [-1, 1])
-    let mut signal: Vec<f32> = vec![0.0; audio.len()];
-    signal[0] = audio[0];
-    for i in 1..audio.len() {
-        signal[i] = audio[i] - PRE_EMPHASIS * audio[i - 1];
-    }
-
-    // Generate Hann window
-    let hann: Vec<f32> = (0..window_size)
-        .map(|i| 0.5 - 0.5 * ((2.0 * PI * i as f32) / (window_size - 1) as f32).cos())
+    // Apply pre-emphasis (input is already f32 in [-1, 1]), written once without a zero-fill
+    let signal: Vec<f32> = std::iter::once(audio[0])
+        .chain(audio.windows(2).map(|w| w[1] - PRE_EMPHASIS * w[0]))
         .collect();
 
-    // Generate mel filterbank
-    let mel_filters = compute_mel_filterbank(sample_rate, FFT_SIZE, NUM_MEL_BINS);
+    // Hann window
+    let hann = HANN_WINDOW.get_or_init(|| {
+        (0..window_size)
+            .map(|i| 0.5 - 0.5 * ((2.0 * PI * i as f32) / (window_size - 1) as f32).cos())
+            .collect()
+    });
+
+    // Mel filterbank
+    let mel_filters = MEL_FILTERBANK.get_or_init(|| {
+        mel::MelBands::from_sparse(&compute_mel_filterbank(sample_rate, FFT_SIZE, NUM_MEL_BINS))
+    });
+
+    let fft = FFT.get_or_init(|| fft::Fft::new(FFT_SIZE));
+    let mut fft_re = vec![0.0f32; FFT_SIZE / 2];
+    let mut fft_im = vec![0.0f32; FFT_SIZE / 2];
+    let mut power_spectrum = vec![0.0f32; FFT_SIZE / 2 + 1];
 
     // Frame the signal and compute features
     let num_frames = (signal.len() - window_size) / hop_size + 1;
@@ -71,29 +83,22 @@ pub fn compute_mel_features(audio: &[f32], sample_rate: usize) -> Result<(Vec<f3
         let start = frame_idx * hop_size;
         let end = start + window_size;
 
-        // Apply window
-        let mut windowed: Vec<f32> = signal[start..end]
-            .iter()
-            .zip(hann.iter())
-            .map(|(s, w)| s * w)
-            .collect();
-
-        // Zero-pad to FFT size
-        windowed.resize(FFT_SIZE, 0.0);
-
-        // Compute power spectrum
-        let power_spectrum = compute_power_spectrum(&windowed);
+        // Window, zero-pad to FFT size and compute power spectrum
+        fft.windowed_power_spectrum(
+            &signal[start..end],
+            hann,
+            &mut fft_re,
+            &mut fft_im,
+            &mut power_spectrum,
+        );
 
         // Apply mel filterbank
-        for filter in &mel_filters {
-            let mut mel_energy = 0.0_f32;
-            for &(freq_bin, weight) in filter {
-                mel_energy += power_spectrum[freq_bin] * weight;
-            }
-
-            // Log mel energy (NO normalization, unlike ASR)
-            features.push((mel_energy + LOG_ZERO_GUARD).ln());
-        }
+        // Log mel energy (NO normalization, unlike ASR)
+        features.extend(
+            mel_filters
+                .energies(&power_spectrum)
+                .map(|mel_energy| (mel_energy + LOG_ZERO_GUARD).ln()),
+        );
     }
 
     Ok((features, num_frames))
@@ -158,24 +163,3 @@ pub fn compute_mel_filterbank(
 
     filters
 }
-
-/// Compute power spectrum from windowed signal using DFT
-fn compute_power_spectrum(signal: &[f32]) -> Vec<f32> {
-    let n = signal.len();
-    let mut power = vec![0.0; n / 2 + 1];
-
-    for k in 0..=n / 2 {
-        let mut real = 0.0;
-        let mut imag = 0.0;
-
-        for (t, &sample) in signal.iter().enumerate() {
-            let angle = -2.0 * PI * k as f32 * t as f32 / n as f32;
-            real += sample * angle.cos();
-            imag += sample * angle.sin();
-        }
-
-        power[k] = real * real + imag * imag;
-    }
-
-    power
-}
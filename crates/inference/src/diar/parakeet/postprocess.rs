@@ -6,6 +6,7 @@ const FRAME_DURATION: f32 = 0.08;
 /// Apply median filter per speaker over time axis.
 pub(crate) fn median_filter(preds: &[f32], num_frames: usize, window: usize) -> Vec<f32> {
     let mut result = vec![0.0; num_frames * NUM_SPEAKERS];
+    let mut window_vals: Vec<f32> = Vec::with_capacity(window + 1);
 
     for spk_idx in 0..NUM_SPEAKERS {
         // Extract this speaker's original predictions (read-only)
@@ -19,10 +20,14 @@ pub(crate) fn median_filter(preds: &[f32], num_frames: usize, window: usize) ->
             let start = frame_idx.saturating_sub(half_window);
             let end = (frame_idx + half_window + 1).min(num_frames);
 
-            let mut window_vals: Vec<f32> = original[start..end].to_vec();
-            window_vals.sort_by(|a, b| a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal));
+            window_vals.clear();
+            window_vals.extend_from_slice(&original[start..end]);
+            // only the middle element is needed, partition instead of sorting
+            let mid = window_vals.len() / 2;
+            let (_, &mut median, _) = window_vals.select_nth_unstable_by(mid, |a, b| {
+                a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal)
+            });
 
-            let median = window_vals[window_vals.len() / 2];
             result[frame_idx * NUM_SPEAKERS + spk_idx] = median;
         }
     }
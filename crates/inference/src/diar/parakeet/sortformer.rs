@@ -215,10 +215,14 @@ impl Sortformer {
                 if speaker_sum < SIL_THRESHOLD {
                     let emb_start = i * EMB_DIM;
                     let emb_end = emb_start + EMB_DIM;
-                    for (j, &emb_val) in pop_out_embs[emb_start..emb_end].iter().enumerate() {
-                        let old_mean = self.mean_sil_emb[j];
-                        let n = self.n_sil_frames as f32;
-                        self.mean_sil_emb[j] = (old_mean * n + emb_val) / (n + 1.0);
+                    // incremental mean: mean += (x - mean) / (n + 1)
+                    let inv_count = 1.0 / (self.n_sil_frames as f32 + 1.0);
+                    for (mean, &emb_val) in self
+                        .mean_sil_emb
+                        .iter_mut()
+                        .zip(&pop_out_embs[emb_start..emb_end])
+                    {
+                        *mean += (emb_val - *mean) * inv_count;
                     }
                     self.n_sil_frames += 1;
                 }
@@ -80,3 +80,19 @@ fn test_get_topk_indices_selects_correct_frames() {
     assert!(indices.contains(&2));
     assert!(indices.contains(&3));
 }
+
+#[test]
+fn test_get_topk_indices_ties_prefer_earlier_frames() {
+    // 8 frames, speaker 0 has equal scores everywhere except frame 5
+    let mut scores = vec![f32::NEG_INFINITY; 8 * NUM_SPEAKERS];
+    for frame_idx in 0..8 {
+        scores[frame_idx * NUM_SPEAKERS] = 1.0;
+    }
+    scores[5 * NUM_SPEAKERS] = 2.0;
+
+    let mut indices = compression::get_topk_indices(&scores, 8, 3);
+    indices.sort_unstable();
+
+    // Same frames a stable descending sort picks: the best one, then the earliest ties
+    assert_eq!(indices, vec![0, 1, 5]);
+}
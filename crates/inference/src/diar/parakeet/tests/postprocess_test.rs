@@ -78,6 +78,41 @@ fn test_median_filter_no_mutation_corruption() {
     }
 }
 
+#[test]
+fn test_median_filter_matches_sorted_window() {
+    // Ties and the shorter, even-length windows at the edges must pick the same element
+    // as sorting each window and taking the one at len / 2
+    let num_frames = 9;
+    let window = 5;
+    let pattern = [0.3, 0.3, 0.7, 0.3, 0.7, 0.7, 0.1, 0.7, 0.1];
+    let mut preds = vec![0.0; num_frames * NUM_SPEAKERS];
+    for frame in 0..num_frames {
+        for spk in 0..NUM_SPEAKERS {
+            preds[frame * NUM_SPEAKERS + spk] = pattern[(frame + spk) % num_frames];
+        }
+    }
+
+    let filtered = postprocess::median_filter(&preds, num_frames, window);
+
+    for spk in 0..NUM_SPEAKERS {
+        for frame in 0..num_frames {
+            let start = frame.saturating_sub(window / 2);
+            let end = (frame + window / 2 + 1).min(num_frames);
+            let mut sorted: Vec<f32> = (start..end)
+                .map(|f| preds[f * NUM_SPEAKERS + spk])
+                .collect();
+            sorted.sort_by(|a, b| a.partial_cmp(b).unwrap());
+            assert_eq!(
+                filtered[frame * NUM_SPEAKERS + spk],
+                sorted[sorted.len() / 2],
+                "speaker {} frame {}",
+                spk,
+                frame
+            );
+        }
+    }
+}
+
 #[test]
 fn test_binarize_produces_segment_with_hysteresis() {
     // Speaker 0: rises above onset, stays above offset, then drops below offset
@@ -0,0 +1,202 @@
+use std::f64::consts::PI;
+
+/// Twiddle factors `(cos, sin)` of `-2πk/size` for k in `0..count`.
+fn twiddles(size: usize, count: usize) -> Vec<(f32, f32)> {
+    (0..count)
+        .map(|k| {
+            let angle = -2.0 * PI * k as f64 / size as f64;
+            (angle.cos() as f32, angle.sin() as f32)
+        })
+        .collect()
+}
+
+/// Radix-2 complex FFT for a fixed power-of-two size.
+///
+/// Input is expected already permuted into bit-reversed order, so callers can
+/// fuse the permutation into however they load their data.
+struct ComplexFft {
+    size: usize,
+    twiddles: Vec<(f32, f32)>,
+    bit_reverse: Vec<usize>,
+}
+
+impl ComplexFft {
+    fn new(size: usize) -> Self {
+        let bits = size.trailing_zeros();
+        let bit_reverse = (0..size)
+            .map(|i| {
+                if bits == 0 {
+                    0
+                } else {
+                    i.reverse_bits() >> (usize::BITS - bits)
+                }
+            })
+            .collect();
+        Self {
+            size,
+            twiddles: twiddles(size, size / 2),
+            bit_reverse,
+        }
+    }
+
+    /// In-place butterflies over bit-reversed `re` + `im`.
+    fn butterflies(&self, re: &mut [f32], im: &mut [f32]) {
+        let n = self.size;
+        let mut half = 1;
+        while half < n {
+            let stride = n / (2 * half);
+            for start in (0..n).step_by(2 * half) {
+                for k in 0..half {
+                    let (wr, wi) = self.twiddles[k * stride];
+                    let a = start + k;
+                    let b = a + half;
+                    let tr = re[b] * wr - im[b] * wi;
+                    let ti = re[b] * wi + im[b] * wr;
+                    re[b] = re[a] - tr;
+                    im[b] = im[a] - ti;
+                    re[a] += tr;
+                    im[a] += ti;
+                }
+            }
+            half *= 2;
+        }
+    }
+}
+
+/// Real-input radix-2 FFT for a fixed power-of-two size.
+///
+/// Packs even/odd samples into an `N/2`-point complex transform and untangles
+/// the result, which halves the work compared to a full complex FFT.
+pub(crate) struct Fft {
+    size: usize,
+    half: ComplexFft,
+    twiddles: Vec<(f32, f32)>,
+}
+
+impl Fft {
+    pub fn new(size: usize) -> Self {
+        assert!(
+            size.is_power_of_two() && size >= 2,
+            "FFT size must be a power of two"
+        );
+        Self {
+            size,
+            half: ComplexFft::new(size / 2),
+            twiddles: twiddles(size, size / 2),
+        }
+    }
+
+    /// Power spectrum `|X[k]|²`, k in `0..=N/2`, of `signal * window` zero-padded to `N`.
+    ///
+    /// Windowing, padding and the bit-reversal permutation are done in the
+    /// same pass that loads the transform. `re` and `im` are scratch buffers
+    /// of `N/2`, `power` must be `N/2 + 1`.
+    pub fn windowed_power_spectrum(
+        &self,
+        signal: &[f32],
+        window: &[f32],
+        re: &mut [f32],
+        im: &mut [f32],
+        power: &mut [f32],
+    ) {
+        let m = self.size / 2;
+        let len = signal.len().min(window.len()).min(self.size);
+        for i in 0..m {
+            let dst = self.half.bit_reverse[i];
+            let even = 2 * i;
+            let odd = even + 1;
+            re[dst] = if even < len {
+                signal[even] * window[even]
+            } else {
+                0.0
+            };
+            im[dst] = if odd < len {
+                signal[odd] * window[odd]
+            } else {
+                0.0
+            };
+        }
+        self.half.butterflies(re, im);
+
+        // X[0] and X[N/2] come from the DC term alone
+        let dc = re[0] + im[0];
+        let nyquist = re[0] - im[0];
+        power[0] = dc * dc;
+        power[m] = nyquist * nyquist;
+        for k in 1..m {
+            let (zr, zi) = (re[k], im[k]);
+            let (cr, ci) = (re[m - k], im[m - k]);
+            let er = 0.5 * (zr + cr);
+            let ei = 0.5 * (zi - ci);
+            let or = 0.5 * (zi + ci);
+            let oi = 0.5 * (cr - zr);
+            let (wr, wi) = self.twiddles[k];
+            let xr = er + wr * or - wi * oi;
+            let xi = ei + wr * oi + wi * or;
+            power[k] = xr * xr + xi * xi;
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn dft_power(signal: &[f32], n: usize) -> Vec<f32> {
+        (0..=n / 2)
+            .map(|k| {
+                let mut re = 0.0f64;
+                let mut im = 0.0f64;
+                for (t, &s) in signal.iter().enumerate() {
+                    let angle = -2.0 * PI * (k * t) as f64 / n as f64;
+                    re += s as f64 * angle.cos();
+                    im += s as f64 * angle.sin();
+                }
+                (re * re + im * im) as f32
+            })
+            .collect()
+    }
+
+    fn power(fft: &Fft, n: usize, signal: &[f32], window: &[f32]) -> Vec<f32> {
+        let mut re = vec![0.0f32; n / 2];
+        let mut im = vec![0.0f32; n / 2];
+        let mut power = vec![0.0f32; n / 2 + 1];
+        fft.windowed_power_spectrum(signal, window, &mut re, &mut im, &mut power);
+        power
+    }
+
+    #[test]
+    fn test_power_spectrum_matches_dft() {
+        let n = 512;
+        let signal: Vec<f32> = (0..400)
+            .map(|i| {
+                let t = i as f32 / n as f32;
+                (2.0 * std::f32::consts::PI * 17.0 * t).sin() + 0.25 * (i % 7) as f32 - 0.5
+            })
+            .collect();
+        let window: Vec<f32> = (0..400)
+            .map(|i| 0.5 - 0.5 * (2.0 * std::f32::consts::PI * i as f32 / 400.0).cos())
+            .collect();
+        let windowed: Vec<f32> = signal.iter().zip(&window).map(|(s, w)| s * w).collect();
+        let expected = dft_power(&windowed, n);
+
+        let got = power(&Fft::new(n), n, &signal, &window);
+        for (k, (&got, &want)) in got.iter().zip(expected.iter()).enumerate() {
+            let tolerance = 1e-3 * want.max(1.0);
+            assert!(
+                (got - want).abs() < tolerance,
+                "bin {k}: got {got}, expected {want}"
+            );
+        }
+    }
+
+    #[test]
+    fn test_power_spectrum_dc() {
+        let ones = vec![1.0f32; 512];
+        let got = power(&Fft::new(512), 512, &ones, &ones);
+        assert!((got[0] - 512.0 * 512.0).abs() < 1.0);
+        for p in &got[1..] {
+            assert!(*p < 1e-3);
+        }
+    }
+}
@@ -3,6 +3,12 @@ use std::fmt;
 mod asr;
 pub use asr::*;
 
+mod argmax;
+
+mod fft;
+
+mod mel;
+
 mod tts;
 pub use tts::*;
 
@@ -181,12 +181,7 @@ pub(crate) fn generate<T: Clone + Send + 'static>(
         let last_pos_logits = &logits_data[last_pos_offset..last_pos_offset + vocab_size];
 
         // Argmax to find next token
-        let next_token_id = match last_pos_logits
-            .iter()
-            .enumerate()
-            .max_by(|(_, a), (_, b)| a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal))
-            .map(|(idx, _)| idx as i64)
-        {
+        let next_token_id = match argmax::argmax(last_pos_logits).map(|idx| idx as i64) {
             Some(id) => id,
             None => {
                 log_error!("Empty logits slice during argmax");
@@ -0,0 +1,84 @@
+/// Mel filterbank stored as contiguous bands.
+///
+/// Each triangular filter only covers a run of neighbouring frequency bins,
+/// so it's kept as a start bin plus a slice into one flat weight buffer.
+/// Applying a filter is then a dense dot product against a slice of the
+/// power spectrum instead of a gather through `(bin, weight)` pairs.
+pub(crate) struct MelBands {
+    starts: Vec<usize>,
+    offsets: Vec<usize>, // band i has weights[offsets[i]..offsets[i + 1]]
+    weights: Vec<f32>,
+}
+
+impl MelBands {
+    /// Pack sparse `(bin, weight)` filters, with bins ascending within each filter.
+    ///
+    /// Bins a filter skips inside its range get a zero weight.
+    pub(crate) fn from_sparse(filters: &[Vec<(usize, f32)>]) -> Self {
+        let mut starts = Vec::with_capacity(filters.len());
+        let mut offsets = Vec::with_capacity(filters.len() + 1);
+        let mut weights = Vec::new();
+        offsets.push(0);
+        for filter in filters {
+            let start = filter.first().map_or(0, |&(bin, _)| bin);
+            let end = filter.last().map_or(start, |&(bin, _)| bin + 1);
+            let base = weights.len();
+            weights.resize(base + end - start, 0.0);
+            for &(bin, weight) in filter {
+                weights[base + bin - start] = weight;
+            }
+            starts.push(start);
+            offsets.push(weights.len());
+        }
+        Self {
+            starts,
+            offsets,
+            weights,
+        }
+    }
+
+    /// Energy of every band in `power_spectrum`, in band order.
+    pub(crate) fn energies<'a>(
+        &'a self,
+        power_spectrum: &'a [f32],
+    ) -> impl Iterator<Item = f32> + 'a {
+        self.starts
+            .iter()
+            .zip(self.offsets.windows(2))
+            .map(move |(&start, range)| {
+                let weights = &self.weights[range[0]..range[1]];
+                power_spectrum[start..start + weights.len()]
+                    .iter()
+                    .zip(weights)
+                    .map(|(power, weight)| power * weight)
+                    .sum()
+            })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_energies_match_sparse() {
+        let filters = vec![
+            vec![(1, 0.5), (2, 1.0), (3, 0.5)],
+            vec![],
+            vec![(2, 0.25), (5, 0.75)],
+        ];
+        let power: Vec<f32> = (0..8).map(|i| i as f32 + 1.0).collect();
+        let bands = MelBands::from_sparse(&filters);
+        let energies: Vec<f32> = bands.energies(&power).collect();
+        let expected: Vec<f32> = filters
+            .iter()
+            .map(|filter| {
+                filter
+                    .iter()
+                    .map(|&(bin, weight)| power[bin] * weight)
+                    .sum()
+            })
+            .collect();
+        assert_eq!(energies, expected);
+    }
+}
@@ -61,6 +61,21 @@ pub struct OrtModelMetadata {
     _private: [u8; 0],
 }
 
+#[repr(C)]
+pub struct OrtIoBinding {
+    _private: [u8; 0],
+}
+
+#[repr(C)]
+pub struct OrtTensorRTProviderOptionsV2 {
+    _private: [u8; 0],
+}
+
+#[repr(C)]
+pub struct OrtCUDAProviderOptionsV2 {
+    _private: [u8; 0],
+}
+
 #[repr(C)]
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub enum OrtLoggingLevel {
@@ -156,14 +171,6 @@ unsafe extern "C" {
     pub fn OrtGetApiBase() -> *const OrtApiBase;
 }
 
-#[cfg(feature = "cuda")]
-unsafe extern "C" {
-    pub fn OrtSessionOptionsAppendExecutionProvider_CUDA(
-        options: *mut OrtSessionOptions,
-        device_id: i32,
-    ) -> *mut OrtStatus;
-}
-
 pub type CreateStatusFn =
     unsafe extern "C" fn(code: OrtErrorCode, msg: *const c_char) -> *mut OrtStatus;
 pub type GetErrorCodeFn = unsafe extern "C" fn(status: *const OrtStatus) -> OrtErrorCode;
@@ -231,6 +238,15 @@ pub type SetSessionGraphOptimizationLevelFn = unsafe extern "C" fn(
 ) -> *mut OrtStatus;
 pub type SetIntraOpNumThreadsFn =
     unsafe extern "C" fn(options: *mut OrtSessionOptions, num_threads: i32) -> *mut OrtStatus;
+pub type SetOptimizedModelFilePathFn = unsafe extern "C" fn(
+    options: *mut OrtSessionOptions,
+    optimized_model_filepath: *const c_char,
+) -> *mut OrtStatus;
+pub type AddSessionConfigEntryFn = unsafe extern "C" fn(
+    options: *mut OrtSessionOptions,
+    config_key: *const c_char,
+    config_value: *const c_char,
+) -> *mut OrtStatus;
 pub type CreateCpuMemoryInfoFn = unsafe extern "C" fn(
     allocator_type: OrtAllocatorType,
     mem_type: OrtMemType,
@@ -293,6 +309,81 @@ pub type ModelMetadataGetCustomMetadataMapKeysFn = unsafe extern "C" fn(
 ) -> *mut OrtStatus;
 pub type ReleaseModelMetadataFn = unsafe extern "C" fn(metadata: *mut OrtModelMetadata);
 
+// Memory info for a named device (e.g. "Cpu", "Cuda")
+pub type CreateMemoryInfoFn = unsafe extern "C" fn(
+    name: *const c_char,
+    allocator_type: OrtAllocatorType,
+    id: i32,
+    mem_type: OrtMemType,
+    out: *mut *mut OrtMemoryInfo,
+) -> *mut OrtStatus;
+
+// IO binding
+pub type CreateIoBindingFn =
+    unsafe extern "C" fn(session: *mut OrtSession, out: *mut *mut OrtIoBinding) -> *mut OrtStatus;
+pub type ReleaseIoBindingFn = unsafe extern "C" fn(binding: *mut OrtIoBinding);
+pub type BindInputFn = unsafe extern "C" fn(
+    binding: *mut OrtIoBinding,
+    name: *const c_char,
+    value: *const OrtValue,
+) -> *mut OrtStatus;
+pub type BindOutputFn = unsafe extern "C" fn(
+    binding: *mut OrtIoBinding,
+    name: *const c_char,
+    value: *const OrtValue,
+) -> *mut OrtStatus;
+pub type BindOutputToDeviceFn = unsafe extern "C" fn(
+    binding: *mut OrtIoBinding,
+    name: *const c_char,
+    memory_info: *const OrtMemoryInfo,
+) -> *mut OrtStatus;
+pub type GetBoundOutputValuesFn = unsafe extern "C" fn(
+    binding: *const OrtIoBinding,
+    allocator: *mut OrtAllocator,
+    output: *mut *mut *mut OrtValue,
+    output_count: *mut usize,
+) -> *mut OrtStatus;
+pub type ClearBoundInputsFn = unsafe extern "C" fn(binding: *mut OrtIoBinding);
+pub type ClearBoundOutputsFn = unsafe extern "C" fn(binding: *mut OrtIoBinding);
+pub type RunWithBindingFn = unsafe extern "C" fn(
+    session: *mut OrtSession,
+    run_options: *const OrtRunOptions,
+    binding: *const OrtIoBinding,
+) -> *mut OrtStatus;
+
+// TensorRT execution provider
+pub type CreateTensorRTProviderOptionsFn =
+    unsafe extern "C" fn(out: *mut *mut OrtTensorRTProviderOptionsV2) -> *mut OrtStatus;
+pub type UpdateTensorRTProviderOptionsFn = unsafe extern "C" fn(
+    tensorrt_options: *mut OrtTensorRTProviderOptionsV2,
+    provider_options_keys: *const *const c_char,
+    provider_options_values: *const *const c_char,
+    num_keys: usize,
+) -> *mut OrtStatus;
+pub type SessionOptionsAppendExecutionProviderTensorRTV2Fn = unsafe extern "C" fn(
+    options: *mut OrtSessionOptions,
+    tensorrt_options: *const OrtTensorRTProviderOptionsV2,
+)
+    -> *mut OrtStatus;
+pub type ReleaseTensorRTProviderOptionsFn =
+    unsafe extern "C" fn(tensorrt_options: *mut OrtTensorRTProviderOptionsV2);
+
+// CUDA execution provider
+pub type CreateCUDAProviderOptionsFn =
+    unsafe extern "C" fn(out: *mut *mut OrtCUDAProviderOptionsV2) -> *mut OrtStatus;
+pub type UpdateCUDAProviderOptionsFn = unsafe extern "C" fn(
+    cuda_options: *mut OrtCUDAProviderOptionsV2,
+    provider_options_keys: *const *const c_char,
+    provider_options_values: *const *const c_char,
+    num_keys: usize,
+) -> *mut OrtStatus;
+pub type SessionOptionsAppendExecutionProviderCUDAV2Fn = unsafe extern "C" fn(
+    options: *mut OrtSessionOptions,
+    cuda_options: *const OrtCUDAProviderOptionsV2,
+) -> *mut OrtStatus;
+pub type ReleaseCUDAProviderOptionsFn =
+    unsafe extern "C" fn(cuda_options: *mut OrtCUDAProviderOptionsV2);
+
 // OrtApi vtable indices — verified against onnxruntime_c_api.h v1.24.2
 // on Jetson (aarch64). These indices are stable across versions since
 // the vtable only grows (new entries appended, existing entries never move).
@@ -306,6 +397,7 @@ pub const IDX_CREATE_ENV: usize = 3;
 pub const IDX_CREATE_SESSION: usize = 7;
 pub const IDX_RUN: usize = 9;
 pub const IDX_CREATE_SESSION_OPTIONS: usize = 10;
+pub const IDX_SET_OPTIMIZED_MODEL_FILE_PATH: usize = 11;
 pub const IDX_SESSION_GET_INPUT_COUNT: usize = 30;
 pub const IDX_SESSION_GET_OUTPUT_COUNT: usize = 31;
 pub const IDX_SESSION_GET_INPUT_TYPE_INFO: usize = 33;
@@ -327,6 +419,7 @@ pub const IDX_GET_TENSOR_ELEMENT_TYPE: usize = 60;
 pub const IDX_GET_TENSOR_SHAPE_ELEMENT_COUNT: usize = 64;
 pub const IDX_GET_TENSOR_TYPE_AND_SHAPE: usize = 65;
 // Memory info
+pub const IDX_CREATE_MEMORY_INFO: usize = 68;
 pub const IDX_CREATE_CPU_MEMORY_INFO: usize = 69;
 // Release functions
 pub const IDX_RELEASE_ENV: usize = 92;
@@ -343,6 +436,28 @@ pub const IDX_SESSION_GET_MODEL_METADATA: usize = 111;
 pub const IDX_MODEL_METADATA_LOOKUP_CUSTOM_METADATA_MAP: usize = 116;
 pub const IDX_RELEASE_MODEL_METADATA: usize = 118;
 pub const IDX_MODEL_METADATA_GET_CUSTOM_METADATA_MAP_KEYS: usize = 123;
+// Session config
+pub const IDX_ADD_SESSION_CONFIG_ENTRY: usize = 130;
+// IO binding
+pub const IDX_RUN_WITH_BINDING: usize = 133;
+pub const IDX_CREATE_IO_BINDING: usize = 134;
+pub const IDX_RELEASE_IO_BINDING: usize = 135;
+pub const IDX_BIND_INPUT: usize = 136;
+pub const IDX_BIND_OUTPUT: usize = 137;
+pub const IDX_BIND_OUTPUT_TO_DEVICE: usize = 138;
+pub const IDX_GET_BOUND_OUTPUT_VALUES: usize = 140;
+pub const IDX_CLEAR_BOUND_INPUTS: usize = 141;
+pub const IDX_CLEAR_BOUND_OUTPUTS: usize = 142;
+// TensorRT execution provider
+pub const IDX_SESSION_OPTIONS_APPEND_EXECUTION_PROVIDER_TENSORRT_V2: usize = 170;
+pub const IDX_CREATE_TENSORRT_PROVIDER_OPTIONS: usize = 171;
+pub const IDX_UPDATE_TENSORRT_PROVIDER_OPTIONS: usize = 172;
+pub const IDX_RELEASE_TENSORRT_PROVIDER_OPTIONS: usize = 174;
+// CUDA execution provider
+pub const IDX_SESSION_OPTIONS_APPEND_EXECUTION_PROVIDER_CUDA_V2: usize = 204;
+pub const IDX_CREATE_CUDA_PROVIDER_OPTIONS: usize = 205;
+pub const IDX_UPDATE_CUDA_PROVIDER_OPTIONS: usize = 206;
+pub const IDX_RELEASE_CUDA_PROVIDER_OPTIONS: usize = 208;
 
 impl OrtApi {
     pub unsafe fn get_fn<F>(&self, index: usize) -> F {
@@ -366,6 +481,7 @@ mod tests {
         assert_eq!(std::mem::size_of::<OrtSessionOptions>(), 0);
         assert_eq!(std::mem::size_of::<OrtValue>(), 0);
         assert_eq!(std::mem::size_of::<OrtStatus>(), 0);
+        assert_eq!(std::mem::size_of::<OrtIoBinding>(), 0);
     }
 
     #[test]
@@ -0,0 +1,152 @@
+use {
+    crate::*,
+    std::{ffi::CString, sync::Arc},
+};
+
+/// Pre-bound inputs and outputs for repeated runs of a session.
+///
+/// Outputs bound to a device stay on that device, so values can be fed back
+/// as inputs of the next run without a round trip through host memory. Bound
+/// inputs reference the `Value`'s data, which has to stay alive until the
+/// input is rebound or cleared.
+pub struct IoBinding {
+    onnx: Arc<Onnx>,
+    binding: *mut ffi::OrtIoBinding,
+}
+
+unsafe impl Send for IoBinding {}
+
+impl IoBinding {
+    pub(crate) fn new(session: &Session) -> Result<Self, OnnxError> {
+        let onnx = &session.onnx;
+        let mut binding: *mut ffi::OrtIoBinding = std::ptr::null_mut();
+        let status = unsafe { (onnx.create_io_binding)(session.session, &mut binding as *mut _) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(onnx.api, status));
+        }
+        Ok(Self {
+            onnx: Arc::clone(onnx),
+            binding,
+        })
+    }
+
+    pub fn bind_input(&mut self, name: &str, value: &Value) -> Result<(), OnnxError> {
+        let c_name =
+            CString::new(name).map_err(|_| OnnxError::runtime_error("Null byte in input name"))?;
+        let status =
+            unsafe { (self.onnx.bind_input)(self.binding, c_name.as_ptr(), value.as_ptr()) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+        Ok(())
+    }
+
+    pub fn bind_output(&mut self, name: &str, value: &Value) -> Result<(), OnnxError> {
+        let c_name =
+            CString::new(name).map_err(|_| OnnxError::runtime_error("Null byte in output name"))?;
+        let status =
+            unsafe { (self.onnx.bind_output)(self.binding, c_name.as_ptr(), value.as_ptr()) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+        Ok(())
+    }
+
+    /// Let the session allocate this output on the executor's device at every run.
+    pub fn bind_output_to_device(
+        &mut self,
+        name: &str,
+        executor: &Executor,
+    ) -> Result<(), OnnxError> {
+        let c_name =
+            CString::new(name).map_err(|_| OnnxError::runtime_error("Null byte in output name"))?;
+        let (device, id) = match executor.resolve() {
+            Executor::Cpu => (c"Cpu", 0),
+            Executor::Cuda(id) | Executor::TensorRt(id) => (c"Cuda", id as i32),
+        };
+        let mut memory_info: *mut ffi::OrtMemoryInfo = std::ptr::null_mut();
+        let status = unsafe {
+            (self.onnx.create_device_memory_info)(
+                device.as_ptr(),
+                ffi::OrtAllocatorType::Device,
+                id,
+                ffi::OrtMemType::Default,
+                &mut memory_info as *mut _,
+            )
+        };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+
+        let status = unsafe {
+            (self.onnx.bind_output_to_device)(self.binding, c_name.as_ptr(), memory_info)
+        };
+        unsafe { (self.onnx.release_memory_info)(memory_info) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+        Ok(())
+    }
+
+    /// Output values of the last run, in the order the outputs were bound.
+    ///
+    /// Values allocated on a device other than the CPU can't be read from the
+    /// host, but can be bound as inputs again.
+    pub fn outputs(&self) -> Result<Vec<Value>, OnnxError> {
+        let mut values_ptr: *mut *mut ffi::OrtValue = std::ptr::null_mut();
+        let mut count: usize = 0;
+        let status = unsafe {
+            (self.onnx.get_bound_output_values)(
+                self.binding,
+                self.onnx.allocator,
+                &mut values_ptr as *mut _,
+                &mut count as *mut _,
+            )
+        };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+        if values_ptr.is_null() {
+            return Ok(Vec::new());
+        }
+
+        let outputs = unsafe { std::slice::from_raw_parts(values_ptr, count) }
+            .iter()
+            .map(|&value_ptr| unsafe { Value::from_raw(&self.onnx, value_ptr) })
+            .collect();
+        unsafe { (self.onnx.allocator_free)(self.onnx.allocator, values_ptr as *mut _) };
+
+        Ok(outputs)
+    }
+
+    pub fn clear_inputs(&mut self) {
+        unsafe { (self.onnx.clear_bound_inputs)(self.binding) };
+    }
+
+    pub fn clear_outputs(&mut self) {
+        unsafe { (self.onnx.clear_bound_outputs)(self.binding) };
+    }
+
+    pub(crate) fn as_ptr(&self) -> *const ffi::OrtIoBinding {
+        self.binding
+    }
+}
+
+impl Drop for IoBinding {
+    fn drop(&mut self) {
+        if !self.binding.is_null() {
+            unsafe { (self.onnx.release_io_binding)(self.binding) };
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_io_binding_is_send() {
+        fn assert_send<T: Send>() {}
+        assert_send::<IoBinding>();
+    }
+}
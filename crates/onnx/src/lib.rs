@@ -6,6 +6,9 @@ pub use onnx::*;
 mod session;
 pub use session::*;
 
+mod io_binding;
+pub use io_binding::*;
+
 pub mod ffi; // myeah, do we really want to expose this?
 
 mod value;
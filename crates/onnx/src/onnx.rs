@@ -7,8 +7,25 @@ use {
 pub enum Executor {
     Cpu,
     Cuda(usize),
+    TensorRt(usize), // TensorRT with FP16 and engine cache, CUDA for unsupported nodes
 }
 
+impl Executor {
+    /// The executor sessions actually run on: without the `cuda` feature no GPU provider is
+    /// appended, so `Cuda` and `TensorRt` sessions run on the CPU.
+    pub fn resolve(&self) -> Executor {
+        if cfg!(feature = "cuda") {
+            self.clone()
+        } else {
+            Executor::Cpu
+        }
+    }
+}
+
+// engine cache directory for TensorRT, relative to the model file
+#[cfg(feature = "cuda")]
+const TENSORRT_CACHE_DIR: &str = "trt_cache";
+
 #[derive(Debug, Clone)]
 pub enum OptimizationLevel {
     Disabled,
@@ -17,6 +34,17 @@ pub enum OptimizationLevel {
     EnableAll,
 }
 
+impl OptimizationLevel {
+    fn to_ffi(&self) -> ffi::GraphOptimizationLevel {
+        match self {
+            OptimizationLevel::Disabled => ffi::GraphOptimizationLevel::DisableAll,
+            OptimizationLevel::EnableBasic => ffi::GraphOptimizationLevel::EnableBasic,
+            OptimizationLevel::EnableExtended => ffi::GraphOptimizationLevel::EnableExtended,
+            OptimizationLevel::EnableAll => ffi::GraphOptimizationLevel::EnableAll,
+        }
+    }
+}
+
 #[derive(Debug, Clone)]
 pub struct Onnx {
     pub(crate) api: *const ffi::OrtApi,
@@ -27,6 +55,8 @@ pub struct Onnx {
     pub(crate) create_session_options: ffi::CreateSessionOptionsFn,
     pub(crate) set_session_graph_optimization_level: ffi::SetSessionGraphOptimizationLevelFn,
     pub(crate) set_intra_op_num_threads: ffi::SetIntraOpNumThreadsFn,
+    pub(crate) set_optimized_model_file_path: ffi::SetOptimizedModelFilePathFn,
+    pub(crate) add_session_config_entry: ffi::AddSessionConfigEntryFn,
     pub(crate) release_session_options: ffi::ReleaseSessionOptionsFn,
     pub(crate) session_get_input_count: ffi::SessionGetInputCountFn,
     pub(crate) session_get_output_count: ffi::SessionGetOutputCountFn,
@@ -55,6 +85,36 @@ pub struct Onnx {
     pub(crate) model_metadata_get_custom_metadata_map_keys:
         ffi::ModelMetadataGetCustomMetadataMapKeysFn,
     pub(crate) release_model_metadata: ffi::ReleaseModelMetadataFn,
+    // IO binding
+    pub(crate) create_device_memory_info: ffi::CreateMemoryInfoFn,
+    pub(crate) create_io_binding: ffi::CreateIoBindingFn,
+    pub(crate) release_io_binding: ffi::ReleaseIoBindingFn,
+    pub(crate) bind_input: ffi::BindInputFn,
+    pub(crate) bind_output: ffi::BindOutputFn,
+    pub(crate) bind_output_to_device: ffi::BindOutputToDeviceFn,
+    pub(crate) get_bound_output_values: ffi::GetBoundOutputValuesFn,
+    pub(crate) clear_bound_inputs: ffi::ClearBoundInputsFn,
+    pub(crate) clear_bound_outputs: ffi::ClearBoundOutputsFn,
+    pub(crate) run_with_binding: ffi::RunWithBindingFn,
+    // TensorRT execution provider
+    #[cfg(feature = "cuda")]
+    pub(crate) create_tensorrt_provider_options: ffi::CreateTensorRTProviderOptionsFn,
+    #[cfg(feature = "cuda")]
+    pub(crate) update_tensorrt_provider_options: ffi::UpdateTensorRTProviderOptionsFn,
+    #[cfg(feature = "cuda")]
+    pub(crate) append_execution_provider_tensorrt:
+        ffi::SessionOptionsAppendExecutionProviderTensorRTV2Fn,
+    #[cfg(feature = "cuda")]
+    pub(crate) release_tensorrt_provider_options: ffi::ReleaseTensorRTProviderOptionsFn,
+    // CUDA execution provider
+    #[cfg(feature = "cuda")]
+    pub(crate) create_cuda_provider_options: ffi::CreateCUDAProviderOptionsFn,
+    #[cfg(feature = "cuda")]
+    pub(crate) update_cuda_provider_options: ffi::UpdateCUDAProviderOptionsFn,
+    #[cfg(feature = "cuda")]
+    pub(crate) append_execution_provider_cuda: ffi::SessionOptionsAppendExecutionProviderCUDAV2Fn,
+    #[cfg(feature = "cuda")]
+    pub(crate) release_cuda_provider_options: ffi::ReleaseCUDAProviderOptionsFn,
 }
 
 unsafe impl Send for Onnx {}
@@ -87,6 +147,10 @@ impl Onnx {
             unsafe { (*api).get_fn(ffi::IDX_SET_SESSION_GRAPH_OPTIMIZATION_LEVEL) };
         let set_intra_op_num_threads: ffi::SetIntraOpNumThreadsFn =
             unsafe { (*api).get_fn(ffi::IDX_SET_INTRA_OP_NUM_THREADS) };
+        let set_optimized_model_file_path: ffi::SetOptimizedModelFilePathFn =
+            unsafe { (*api).get_fn(ffi::IDX_SET_OPTIMIZED_MODEL_FILE_PATH) };
+        let add_session_config_entry: ffi::AddSessionConfigEntryFn =
+            unsafe { (*api).get_fn(ffi::IDX_ADD_SESSION_CONFIG_ENTRY) };
         let release_session_options: ffi::ReleaseSessionOptionsFn =
             unsafe { (*api).get_fn(ffi::IDX_RELEASE_SESSION_OPTIONS) };
         let session_get_input_count: ffi::SessionGetInputCountFn =
@@ -135,6 +199,48 @@ impl Onnx {
             unsafe { (*api).get_fn(ffi::IDX_MODEL_METADATA_GET_CUSTOM_METADATA_MAP_KEYS) };
         let release_model_metadata: ffi::ReleaseModelMetadataFn =
             unsafe { (*api).get_fn(ffi::IDX_RELEASE_MODEL_METADATA) };
+        let create_device_memory_info: ffi::CreateMemoryInfoFn =
+            unsafe { (*api).get_fn(ffi::IDX_CREATE_MEMORY_INFO) };
+        let create_io_binding: ffi::CreateIoBindingFn =
+            unsafe { (*api).get_fn(ffi::IDX_CREATE_IO_BINDING) };
+        let release_io_binding: ffi::ReleaseIoBindingFn =
+            unsafe { (*api).get_fn(ffi::IDX_RELEASE_IO_BINDING) };
+        let bind_input: ffi::BindInputFn = unsafe { (*api).get_fn(ffi::IDX_BIND_INPUT) };
+        let bind_output: ffi::BindOutputFn = unsafe { (*api).get_fn(ffi::IDX_BIND_OUTPUT) };
+        let bind_output_to_device: ffi::BindOutputToDeviceFn =
+            unsafe { (*api).get_fn(ffi::IDX_BIND_OUTPUT_TO_DEVICE) };
+        let get_bound_output_values: ffi::GetBoundOutputValuesFn =
+            unsafe { (*api).get_fn(ffi::IDX_GET_BOUND_OUTPUT_VALUES) };
+        let clear_bound_inputs: ffi::ClearBoundInputsFn =
+            unsafe { (*api).get_fn(ffi::IDX_CLEAR_BOUND_INPUTS) };
+        let clear_bound_outputs: ffi::ClearBoundOutputsFn =
+            unsafe { (*api).get_fn(ffi::IDX_CLEAR_BOUND_OUTPUTS) };
+        let run_with_binding: ffi::RunWithBindingFn =
+            unsafe { (*api).get_fn(ffi::IDX_RUN_WITH_BINDING) };
+        #[cfg(feature = "cuda")]
+        let create_tensorrt_provider_options: ffi::CreateTensorRTProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_CREATE_TENSORRT_PROVIDER_OPTIONS) };
+        #[cfg(feature = "cuda")]
+        let update_tensorrt_provider_options: ffi::UpdateTensorRTProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_UPDATE_TENSORRT_PROVIDER_OPTIONS) };
+        #[cfg(feature = "cuda")]
+        let append_execution_provider_tensorrt: ffi::SessionOptionsAppendExecutionProviderTensorRTV2Fn =
+            unsafe { (*api).get_fn(ffi::IDX_SESSION_OPTIONS_APPEND_EXECUTION_PROVIDER_TENSORRT_V2) };
+        #[cfg(feature = "cuda")]
+        let release_tensorrt_provider_options: ffi::ReleaseTensorRTProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_RELEASE_TENSORRT_PROVIDER_OPTIONS) };
+        #[cfg(feature = "cuda")]
+        let create_cuda_provider_options: ffi::CreateCUDAProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_CREATE_CUDA_PROVIDER_OPTIONS) };
+        #[cfg(feature = "cuda")]
+        let update_cuda_provider_options: ffi::UpdateCUDAProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_UPDATE_CUDA_PROVIDER_OPTIONS) };
+        #[cfg(feature = "cuda")]
+        let append_execution_provider_cuda: ffi::SessionOptionsAppendExecutionProviderCUDAV2Fn =
+            unsafe { (*api).get_fn(ffi::IDX_SESSION_OPTIONS_APPEND_EXECUTION_PROVIDER_CUDA_V2) };
+        #[cfg(feature = "cuda")]
+        let release_cuda_provider_options: ffi::ReleaseCUDAProviderOptionsFn =
+            unsafe { (*api).get_fn(ffi::IDX_RELEASE_CUDA_PROVIDER_OPTIONS) };
 
         // create environment
         let log_id = CString::new("onnx").unwrap();
@@ -169,6 +275,8 @@ impl Onnx {
             create_session_options,
             set_session_graph_optimization_level,
             set_intra_op_num_threads,
+            set_optimized_model_file_path,
+            add_session_config_entry,
             release_session_options,
             session_get_input_count,
             session_get_output_count,
@@ -194,6 +302,32 @@ impl Onnx {
             model_metadata_lookup_custom_metadata_map,
             model_metadata_get_custom_metadata_map_keys,
             release_model_metadata,
+            create_device_memory_info,
+            create_io_binding,
+            release_io_binding,
+            bind_input,
+            bind_output,
+            bind_output_to_device,
+            get_bound_output_values,
+            clear_bound_inputs,
+            clear_bound_outputs,
+            run_with_binding,
+            #[cfg(feature = "cuda")]
+            create_tensorrt_provider_options,
+            #[cfg(feature = "cuda")]
+            update_tensorrt_provider_options,
+            #[cfg(feature = "cuda")]
+            append_execution_provider_tensorrt,
+            #[cfg(feature = "cuda")]
+            release_tensorrt_provider_options,
+            #[cfg(feature = "cuda")]
+            create_cuda_provider_options,
+            #[cfg(feature = "cuda")]
+            update_cuda_provider_options,
+            #[cfg(feature = "cuda")]
+            append_execution_provider_cuda,
+            #[cfg(feature = "cuda")]
+            release_cuda_provider_options,
         }))
     }
 
@@ -204,34 +338,57 @@ impl Onnx {
         threads: usize,
         model_path: impl AsRef<Path>,
     ) -> Result<Session, OnnxError> {
+        self.create_session_with_config(executor, optimization_level, threads, &[], model_path)
+    }
+
+    /// Create a session with additional session config entries.
+    ///
+    /// `config_entries` are `(key, value)` pairs as understood by ORT's
+    /// `AddSessionConfigEntry`, e.g. `("session.intra_op.allow_spinning", "0")`.
+    pub fn create_session_with_config(
+        self: &Arc<Self>,
+        executor: &Executor,
+        optimization_level: &OptimizationLevel,
+        threads: usize,
+        config_entries: &[(&str, &str)],
+        model_path: impl AsRef<Path>,
+    ) -> Result<Session, OnnxError> {
+        let config_entries = config_entries
+            .iter()
+            .map(|(key, value)| Ok((CString::new(*key)?, CString::new(*value)?)))
+            .collect::<Result<Vec<_>, std::ffi::NulError>>()
+            .map_err(|_| OnnxError::runtime_error("Null byte in session config entry"))?;
+
         let mut options: *mut ffi::OrtSessionOptions = null_mut();
         let status = unsafe { (self.create_session_options)(&mut options as *mut _) };
         if !status.is_null() {
             return Err(OnnxError::from_status(self.api, status));
         }
 
+        // CUDA runs everything for Cuda, and whatever TensorRT can't take for TensorRt
         #[cfg(feature = "cuda")]
-        if let Executor::Cuda(id) = executor {
-            let status =
-                unsafe { ffi::OrtSessionOptionsAppendExecutionProvider_CUDA(options, *id as i32) };
-            if !status.is_null() {
+        {
+            let appended = match executor {
+                Executor::Cpu => Ok(()),
+                Executor::Cuda(id) => self.append_cuda(options, *id),
+                Executor::TensorRt(id) => {
+                    let cache_path = model_path
+                        .as_ref()
+                        .parent()
+                        .unwrap_or(Path::new("."))
+                        .join(TENSORRT_CACHE_DIR);
+                    self.append_tensorrt(options, *id, &cache_path)
+                        .and_then(|_| self.append_cuda(options, *id))
+                }
+            };
+            if let Err(error) = appended {
                 unsafe { (self.release_session_options)(options) };
-                return Err(OnnxError::from_status(self.api, status));
+                return Err(error);
             }
         }
 
         let status = unsafe {
-            (self.set_session_graph_optimization_level)(
-                options,
-                match optimization_level {
-                    OptimizationLevel::Disabled => ffi::GraphOptimizationLevel::DisableAll,
-                    OptimizationLevel::EnableBasic => ffi::GraphOptimizationLevel::EnableBasic,
-                    OptimizationLevel::EnableExtended => {
-                        ffi::GraphOptimizationLevel::EnableExtended
-                    }
-                    OptimizationLevel::EnableAll => ffi::GraphOptimizationLevel::EnableAll,
-                },
-            )
+            (self.set_session_graph_optimization_level)(options, optimization_level.to_ffi())
         };
         if !status.is_null() {
             unsafe { (self.release_session_options)(options) };
@@ -244,6 +401,15 @@ impl Onnx {
             return Err(OnnxError::from_status(self.api, status));
         }
 
+        for (key, value) in &config_entries {
+            let status =
+                unsafe { (self.add_session_config_entry)(options, key.as_ptr(), value.as_ptr()) };
+            if !status.is_null() {
+                unsafe { (self.release_session_options)(options) };
+                return Err(OnnxError::from_status(self.api, status));
+            }
+        }
+
         let path_str = model_path
             .as_ref()
             .to_str()
@@ -271,6 +437,184 @@ impl Onnx {
             session,
         })
     }
+
+    /// Optimize a model for the CPU executor and save the optimized graph.
+    ///
+    /// Initializers are written to an external data file next to
+    /// `optimized_path`, so large models stay within the protobuf size limit.
+    /// Loading the saved model with `OptimizationLevel::Disabled` skips redoing
+    /// the graph optimizations at every session creation.
+    pub fn save_optimized_model(
+        self: &Arc<Self>,
+        optimization_level: &OptimizationLevel,
+        model_path: impl AsRef<Path>,
+        optimized_path: impl AsRef<Path>,
+    ) -> Result<(), OnnxError> {
+        let path_str = model_path
+            .as_ref()
+            .to_str()
+            .ok_or_else(|| OnnxError::runtime_error("Invalid UTF-8 in model path"))?;
+        let c_path = CString::new(path_str)
+            .map_err(|_| OnnxError::runtime_error("Null byte in model path"))?;
+        let optimized_str = optimized_path
+            .as_ref()
+            .to_str()
+            .ok_or_else(|| OnnxError::runtime_error("Invalid UTF-8 in optimized model path"))?;
+        let c_optimized_path = CString::new(optimized_str)
+            .map_err(|_| OnnxError::runtime_error("Null byte in optimized model path"))?;
+        let data_name = optimized_path
+            .as_ref()
+            .file_name()
+            .and_then(|name| name.to_str())
+            .map(|name| format!("{name}.data"))
+            .ok_or_else(|| OnnxError::runtime_error("Invalid optimized model path"))?;
+        let c_data_name = CString::new(data_name)
+            .map_err(|_| OnnxError::runtime_error("Null byte in optimized model path"))?;
+
+        let mut options: *mut ffi::OrtSessionOptions = null_mut();
+        let status = unsafe { (self.create_session_options)(&mut options as *mut _) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+
+        let status = unsafe {
+            (self.set_session_graph_optimization_level)(options, optimization_level.to_ffi())
+        };
+        if !status.is_null() {
+            unsafe { (self.release_session_options)(options) };
+            return Err(OnnxError::from_status(self.api, status));
+        }
+
+        let status =
+            unsafe { (self.set_optimized_model_file_path)(options, c_optimized_path.as_ptr()) };
+        if !status.is_null() {
+            unsafe { (self.release_session_options)(options) };
+            return Err(OnnxError::from_status(self.api, status));
+        }
+
+        let status = unsafe {
+            (self.add_session_config_entry)(
+                options,
+                c"session.optimized_model_external_initializers_file_name".as_ptr(),
+                c_data_name.as_ptr(),
+            )
+        };
+        if !status.is_null() {
+            unsafe { (self.release_session_options)(options) };
+            return Err(OnnxError::from_status(self.api, status));
+        }
+
+        // creating the session runs the optimizations and writes the result
+        let mut session: *mut ffi::OrtSession = null_mut();
+        let status = unsafe {
+            (self.create_session)(
+                self.environment,
+                c_path.as_ptr(),
+                options,
+                &mut session as *mut _,
+            )
+        };
+        unsafe { (self.release_session_options)(options) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        unsafe { (self.release_session)(session) };
+
+        Ok(())
+    }
+
+    #[cfg(feature = "cuda")]
+    fn append_tensorrt(
+        &self,
+        options: *mut ffi::OrtSessionOptions,
+        device_id: usize,
+        cache_path: &Path,
+    ) -> Result<(), OnnxError> {
+        let cache_path = cache_path
+            .to_str()
+            .ok_or_else(|| OnnxError::runtime_error("Invalid UTF-8 in TensorRT cache path"))?;
+        let device_id = CString::new(device_id.to_string()).unwrap();
+        let cache_path = CString::new(cache_path)
+            .map_err(|_| OnnxError::runtime_error("Null byte in TensorRT cache path"))?;
+        let keys = [
+            c"device_id".as_ptr(),
+            c"trt_fp16_enable".as_ptr(),
+            c"trt_engine_cache_enable".as_ptr(),
+            c"trt_engine_cache_path".as_ptr(),
+        ];
+        let values = [
+            device_id.as_ptr(),
+            c"1".as_ptr(),
+            c"1".as_ptr(),
+            cache_path.as_ptr(),
+        ];
+
+        let mut tensorrt_options: *mut ffi::OrtTensorRTProviderOptionsV2 = null_mut();
+        let status =
+            unsafe { (self.create_tensorrt_provider_options)(&mut tensorrt_options as *mut _) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        let status = unsafe {
+            (self.update_tensorrt_provider_options)(
+                tensorrt_options,
+                keys.as_ptr(),
+                values.as_ptr(),
+                keys.len(),
+            )
+        };
+        if !status.is_null() {
+            unsafe { (self.release_tensorrt_provider_options)(tensorrt_options) };
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        let status =
+            unsafe { (self.append_execution_provider_tensorrt)(options, tensorrt_options) };
+        unsafe { (self.release_tensorrt_provider_options)(tensorrt_options) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        Ok(())
+    }
+
+    /// Append the CUDA executor.
+    ///
+    /// cuDNN picks convolution algorithms with its heuristics instead of
+    /// benchmarking all of them (ORT's default), so a new input shape, like
+    /// the shorter last window of an utterance, doesn't stall on a search.
+    #[cfg(feature = "cuda")]
+    fn append_cuda(
+        &self,
+        options: *mut ffi::OrtSessionOptions,
+        device_id: usize,
+    ) -> Result<(), OnnxError> {
+        let device_id = CString::new(device_id.to_string()).unwrap();
+        let keys = [c"device_id".as_ptr(), c"cudnn_conv_algo_search".as_ptr()];
+        let values = [device_id.as_ptr(), c"DEFAULT".as_ptr()];
+
+        let mut cuda_options: *mut ffi::OrtCUDAProviderOptionsV2 = null_mut();
+        let status = unsafe { (self.create_cuda_provider_options)(&mut cuda_options as *mut _) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        let status = unsafe {
+            (self.update_cuda_provider_options)(
+                cuda_options,
+                keys.as_ptr(),
+                values.as_ptr(),
+                keys.len(),
+            )
+        };
+        if !status.is_null() {
+            unsafe { (self.release_cuda_provider_options)(cuda_options) };
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        let status = unsafe { (self.append_execution_provider_cuda)(options, cuda_options) };
+        unsafe { (self.release_cuda_provider_options)(cuda_options) };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.api, status));
+        }
+        Ok(())
+    }
 }
 
 impl Drop for Onnx {
@@ -336,6 +336,28 @@ impl Session {
 
         Ok(outputs)
     }
+
+    /// Create an IO binding for this session. The session must outlive it.
+    pub fn create_io_binding(&self) -> Result<IoBinding, OnnxError> {
+        IoBinding::new(self)
+    }
+
+    /// Run inference on the inputs and outputs bound in `binding`.
+    ///
+    /// Results are read back with `IoBinding::outputs`.
+    pub fn run_with_binding(&mut self, binding: &IoBinding) -> Result<(), OnnxError> {
+        let status = unsafe {
+            (self.onnx.run_with_binding)(
+                self.session,
+                std::ptr::null(), // run_options (null = default)
+                binding.as_ptr(),
+            )
+        };
+        if !status.is_null() {
+            return Err(OnnxError::from_status(self.onnx.api, status));
+        }
+        Ok(())
+    }
 }
 
 impl Drop for Session {
@@ -71,54 +71,12 @@ impl Value {
             )));
         }
 
-        // Copy data into owned buffer
+        // Copy data into owned buffer, in a single pass
         let byte_len = data.len() * std::mem::size_of::<T>();
-        let mut buffer = vec![0u8; byte_len].into_boxed_slice();
-        let src_ptr = data.as_ptr() as *const u8;
-        unsafe { std::ptr::copy_nonoverlapping(src_ptr, buffer.as_mut_ptr(), byte_len) };
+        let buffer: Box<[u8]> =
+            unsafe { std::slice::from_raw_parts(data.as_ptr() as *const u8, byte_len) }.into();
 
-        // Create memory info for CPU
-        let mut memory_info: *mut ffi::OrtMemoryInfo = std::ptr::null_mut();
-        let status = unsafe {
-            (onnx.create_memory_info)(
-                ffi::OrtAllocatorType::Device,
-                ffi::OrtMemType::CpuOutput,
-                &mut memory_info as *mut _,
-            )
-        };
-        if !status.is_null() {
-            return Err(OnnxError::from_status(onnx.api, status));
-        }
-
-        // Convert shape to i64
-        let shape_i64: Vec<i64> = shape.iter().map(|&s| s as i64).collect();
-
-        // Create tensor
-        let mut value: *mut ffi::OrtValue = std::ptr::null_mut();
-        let status = unsafe {
-            (onnx.create_tensor)(
-                memory_info,
-                buffer.as_mut_ptr() as *mut std::ffi::c_void,
-                byte_len,
-                shape_i64.as_ptr(),
-                shape_i64.len(),
-                T::element_type(),
-                &mut value as *mut _,
-            )
-        };
-        if !status.is_null() {
-            unsafe { (onnx.release_memory_info)(memory_info) };
-            return Err(OnnxError::from_status(onnx.api, status));
-        }
-
-        // Release memory info
-        unsafe { (onnx.release_memory_info)(memory_info) };
-
-        Ok(Value {
-            onnx: Arc::clone(&onnx),
-            value,
-            _data: buffer,
-        })
+        Self::from_buffer(onnx, shape, buffer, T::element_type())
     }
 
     pub fn as_slice_mut<T: TensorElement>(&mut self) -> &mut [T] {
@@ -131,8 +89,32 @@ impl Value {
         shape: &[usize],
         element_type: ffi::ONNXTensorElementDataType,
     ) -> Result<Self, OnnxError> {
-        let buffer = vec![0u8; 0].into_boxed_slice();
+        Self::from_buffer(onnx, shape, Box::new([]), element_type)
+    }
+
+    pub fn zeros<T: TensorElement + Default>(
+        onnx: &Arc<Onnx>,
+        shape: &[i64],
+    ) -> Result<Self, OnnxError> {
+        let resolved: Vec<usize> = shape
+            .iter()
+            .map(|&d| if d < 0 { 1 } else { d as usize })
+            .collect();
+        let total: usize = resolved.iter().product();
+        // all-zero bytes are the default of every element type, so the buffer
+        // comes zeroed from the allocator instead of being built and copied
+        let buffer = vec![0u8; total * std::mem::size_of::<T>()].into_boxed_slice();
+        Self::from_buffer(onnx, &resolved, buffer, T::element_type())
+    }
 
+    /// Wrap an owned CPU buffer as a tensor, without copying it.
+    fn from_buffer(
+        onnx: &Arc<Onnx>,
+        shape: &[usize],
+        mut buffer: Box<[u8]>,
+        element_type: ffi::ONNXTensorElementDataType,
+    ) -> Result<Self, OnnxError> {
+        // Create memory info for CPU
         let mut memory_info: *mut ffi::OrtMemoryInfo = std::ptr::null_mut();
         let status = unsafe {
             (onnx.create_memory_info)(
@@ -145,14 +127,16 @@ impl Value {
             return Err(OnnxError::from_status(onnx.api, status));
         }
 
+        // Convert shape to i64
         let shape_i64: Vec<i64> = shape.iter().map(|&s| s as i64).collect();
 
+        // Create tensor
         let mut value: *mut ffi::OrtValue = std::ptr::null_mut();
         let status = unsafe {
             (onnx.create_tensor)(
                 memory_info,
-                buffer.as_ptr() as *mut std::ffi::c_void,
-                0,
+                buffer.as_mut_ptr() as *mut std::ffi::c_void,
+                buffer.len(),
                 shape_i64.as_ptr(),
                 shape_i64.len(),
                 element_type,
@@ -164,6 +148,7 @@ impl Value {
             return Err(OnnxError::from_status(onnx.api, status));
         }
 
+        // Release memory info
         unsafe { (onnx.release_memory_info)(memory_info) };
 
         Ok(Value {
@@ -173,19 +158,6 @@ impl Value {
         })
     }
 
-    pub fn zeros<T: TensorElement + Default>(
-        onnx: &Arc<Onnx>,
-        shape: &[i64],
-    ) -> Result<Self, OnnxError> {
-        let resolved: Vec<usize> = shape
-            .iter()
-            .map(|&d| if d < 0 { 1 } else { d as usize })
-            .collect();
-        let total: usize = resolved.iter().product();
-        let data = vec![T::default(); total];
-        Self::from_slice(onnx, &resolved, &data)
-    }
-
     pub fn extract_tensor<T: TensorElement>(&self) -> Result<&[T], OnnxError> {
         // Get tensor type and shape info
         let mut type_info: *mut ffi::OrtTensorTypeAndShapeInfo = std::ptr::null_mut();
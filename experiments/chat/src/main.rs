@@ -94,7 +94,8 @@ async fn main() -> Result<(), InferError> {
 
     // load ASR
     log_info!("Loading ASR...");
-    let (asr_handle, mut asr_listener) = inference.use_parakeet::<u64>(&onnx::Executor::Cuda(0))?;
+    let (asr_handle, mut asr_listener) =
+        inference.use_parakeet::<u64>(&onnx::Executor::TensorRt(0))?;
     let asr_handle = Arc::new(asr_handle);
     println!(">> {}", inference.mem_info());
 
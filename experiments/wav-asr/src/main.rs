@@ -26,35 +26,28 @@ async fn main() -> Result<(), InferError> {
         spec.bits_per_sample
     );
 
-    // Read all samples as i32 (hound normalizes per bit depth) then scale to i16 range
-    let all_samples: Vec<i16> = match spec.sample_format {
+    // Read all samples as i32 (sign-extended from the file's bit depth) then shift to i16 range,
+    // integer samples never go through f32
+    let samples: Box<dyn Iterator<Item = Result<i16, hound::Error>>> = match spec.sample_format {
         hound::SampleFormat::Int => {
-            let max_val = (1i32 << (spec.bits_per_sample - 1)) as f32;
-            reader
-                .into_samples::<i32>()
-                .map(|s| s.map(|v| (v as f32 / max_val * i16::MAX as f32) as i16))
-                .collect::<Result<_, _>>()
-                .map_err(|e| InferError::Runtime(e.to_string()))?
+            let bits = spec.bits_per_sample as u32;
+            Box::new(
+                reader
+                    .into_samples::<i32>()
+                    .map(move |s| s.map(|v| audio::int_to_i16(v, bits))),
+            )
         }
-        hound::SampleFormat::Float => reader
-            .into_samples::<f32>()
-            .map(|s| s.map(|v| (v * i16::MAX as f32) as i16))
-            .collect::<Result<_, _>>()
-            .map_err(|e| InferError::Runtime(e.to_string()))?,
+        hound::SampleFormat::Float => Box::new(
+            reader
+                .into_samples::<f32>()
+                .map(|s| s.map(|v| (v * i16::MAX as f32) as i16)),
+        ),
     };
 
     // Convert to mono if stereo
-    let mono_samples: Vec<i16> = if spec.channels > 1 {
-        all_samples
-            .chunks(spec.channels as usize)
-            .map(|frame| {
-                let sum: i32 = frame.iter().map(|&s| s as i32).sum();
-                (sum / frame.len() as i32) as i16
-            })
-            .collect()
-    } else {
-        all_samples
-    };
+    let mono_samples: Vec<i16> = audio::MonoSamples::new(samples, spec.channels as usize)
+        .collect::<Result<_, _>>()
+        .map_err(|e| InferError::Runtime(e.to_string()))?;
 
     // Resample to 16kHz if needed
     let samples = if spec.sample_rate != SAMPLE_RATE as u32 {
@@ -63,7 +56,7 @@ async fn main() -> Result<(), InferError> {
             spec.sample_rate,
             SAMPLE_RATE
         );
-        resample(&mono_samples, spec.sample_rate, SAMPLE_RATE as u32)
+        audio::resample(&mono_samples, spec.sample_rate as usize, SAMPLE_RATE)
     } else {
         mono_samples
     };
@@ -105,28 +98,3 @@ async fn main() -> Result<(), InferError> {
 
     Ok(())
 }
-
-/// Linear interpolation resampling from `from_rate` to `to_rate`.
-fn resample(samples: &[i16], from_rate: u32, to_rate: u32) -> Vec<i16> {
-    let ratio = from_rate as f64 / to_rate as f64;
-    let out_len = (samples.len() as f64 / ratio) as usize;
-    let mut output = Vec::with_capacity(out_len);
-
-    for i in 0..out_len {
-        let src_pos = i as f64 * ratio;
-        let idx = src_pos as usize;
-        let frac = src_pos - idx as f64;
-
-        let sample = if idx + 1 < samples.len() {
-            let a = samples[idx] as f64;
-            let b = samples[idx + 1] as f64;
-            (a + (b - a) * frac) as i16
-        } else {
-            samples[idx]
-        };
-
-        output.push(sample);
-    }
-
-    output
-}
@@ -7,7 +7,6 @@ use {
 
 const SAMPLE_RATE: usize = 16000;
 const CHUNK_DURATION_MS: usize = 100;
-const CHUNK_SAMPLES: usize = SAMPLE_RATE * CHUNK_DURATION_MS / 1000;
 
 #[tokio::main]
 async fn main() -> Result<(), Box<dyn std::error::Error>> {
@@ -30,47 +29,36 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         spec.bits_per_sample
     );
 
-    let all_samples: Vec<i16> = match spec.sample_format {
+    let duration_secs = reader.duration() as f64 / spec.sample_rate as f64;
+    log_info!("Audio: {:.1}s", duration_secs);
+
+    // Decode samples lazily, so the file is read chunk by chunk as it is fed
+    let samples: Box<dyn Iterator<Item = Result<i16, hound::Error>>> = match spec.sample_format {
         hound::SampleFormat::Int => {
-            let max_val = (1i32 << (spec.bits_per_sample - 1)) as f32;
-            reader
-                .into_samples::<i32>()
-                .map(|s| s.map(|v| (v as f32 / max_val * i16::MAX as f32) as i16))
-                .collect::<Result<_, _>>()?
+            let bits = spec.bits_per_sample as u32;
+            Box::new(
+                reader
+                    .into_samples::<i32>()
+                    .map(move |s| s.map(|v| audio::int_to_i16(v, bits))),
+            )
         }
-        hound::SampleFormat::Float => reader
-            .into_samples::<f32>()
-            .map(|s| s.map(|v| (v * i16::MAX as f32) as i16))
-            .collect::<Result<_, _>>()?,
-    };
-
-    // Convert to mono if stereo
-    let mono_samples: Vec<i16> = if spec.channels > 1 {
-        all_samples
-            .chunks(spec.channels as usize)
-            .map(|frame| {
-                let sum: i32 = frame.iter().map(|&s| s as i32).sum();
-                (sum / frame.len() as i32) as i16
-            })
-            .collect()
-    } else {
-        all_samples
+        hound::SampleFormat::Float => Box::new(
+            reader
+                .into_samples::<f32>()
+                .map(|s| s.map(|v| (v * i16::MAX as f32) as i16)),
+        ),
     };
+    let mut mono_samples = audio::MonoSamples::new(samples, spec.channels as usize);
 
-    // Resample to 16kHz if needed
-    let samples = if spec.sample_rate != SAMPLE_RATE as u32 {
+    if spec.sample_rate != SAMPLE_RATE as u32 {
         log_info!(
             "Resampling from {} Hz to {} Hz",
             spec.sample_rate,
             SAMPLE_RATE
         );
-        resample(&mono_samples, spec.sample_rate, SAMPLE_RATE as u32)
-    } else {
-        mono_samples
-    };
-
-    let duration_secs = samples.len() as f64 / SAMPLE_RATE as f64;
-    log_info!("Audio: {:.1}s, {} samples", duration_secs, samples.len());
+    }
+    let source_chunk_samples = spec.sample_rate as usize * CHUNK_DURATION_MS / 1000;
+    let mut resampler = audio::Resampler::new(spec.sample_rate as usize, SAMPLE_RATE);
 
     // Load streaming ASR
     let inference = Inference::cpu()?;
@@ -81,8 +69,22 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
     let start = Instant::now();
     let mut printed_len = 0;
 
-    for chunk in samples.chunks(CHUNK_SAMPLES) {
-        let tensor = Tensor::new(vec![chunk.len()], chunk.to_vec())?;
+    let mut at_end = false;
+    while !at_end {
+        let chunk = mono_samples
+            .by_ref()
+            .take(source_chunk_samples)
+            .collect::<Result<Vec<_>, _>>()?;
+        let chunk = if chunk.is_empty() {
+            at_end = true;
+            resampler.flush()
+        } else {
+            resampler.process(&chunk)
+        };
+        if chunk.is_empty() {
+            continue;
+        }
+        let tensor = Tensor::new(vec![chunk.len()], chunk)?;
         let sample = AudioSample {
             data: AudioData::Pcm(tensor),
             sample_rate: SAMPLE_RATE,
@@ -91,21 +93,8 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
 
         // Drain any ready transcriptions
         while let Some(result) = asr.try_recv() {
-            match result {
-                Ok(Transcription::Partial { ref text, .. }) => {
-                    if text.len() > printed_len {
-                        print!("{}", &text[printed_len..]);
-                        printed_len = text.len();
-                    }
-                }
-                Ok(Transcription::Final { ref text, .. }) => {
-                    if text.len() > printed_len {
-                        print!("{}", &text[printed_len..]);
-                    }
-                    println!();
-                    printed_len = 0;
-                }
-                _ => break,
+            if !print_transcription(result, &mut printed_len) {
+                break;
             }
         }
     }
@@ -113,24 +102,7 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
     // Close and drain remaining
     asr.close().await?;
     while let Some(result) = asr.try_recv() {
-        match result {
-            Ok(Transcription::Partial { ref text, .. }) => {
-                if text.len() > printed_len {
-                    print!("{}", &text[printed_len..]);
-                    printed_len = text.len();
-                }
-            }
-            Ok(Transcription::Final { ref text, .. }) => {
-                if text.len() > printed_len {
-                    print!("{}", &text[printed_len..]);
-                }
-                println!();
-            }
-            Ok(Transcription::Cancelled) => {}
-            Err(e) => {
-                log_error!("Transcription error: {}", e);
-            }
-        }
+        print_transcription(result, &mut printed_len);
     }
 
     let elapsed = start.elapsed();
@@ -144,26 +116,31 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
     Ok(())
 }
 
-fn resample(samples: &[i16], from_rate: u32, to_rate: u32) -> Vec<i16> {
-    let ratio = from_rate as f64 / to_rate as f64;
-    let out_len = (samples.len() as f64 / ratio) as usize;
-    let mut output = Vec::with_capacity(out_len);
-
-    for i in 0..out_len {
-        let src_pos = i as f64 * ratio;
-        let idx = src_pos as usize;
-        let frac = src_pos - idx as f64;
-
-        let sample = if idx + 1 < samples.len() {
-            let a = samples[idx] as f64;
-            let b = samples[idx + 1] as f64;
-            (a + (b - a) * frac) as i16
-        } else {
-            samples[idx]
-        };
-
-        output.push(sample);
+/// Print the part of `result` not printed yet, returns false if it carried no text.
+fn print_transcription<E: std::fmt::Display>(
+    result: Result<Transcription, E>,
+    printed_len: &mut usize,
+) -> bool {
+    match result {
+        Ok(Transcription::Partial { ref text, .. }) => {
+            if text.len() > *printed_len {
+                print!("{}", &text[*printed_len..]);
+                *printed_len = text.len();
+            }
+            true
+        }
+        Ok(Transcription::Final { ref text, .. }) => {
+            if text.len() > *printed_len {
+                print!("{}", &text[*printed_len..]);
+            }
+            println!();
+            *printed_len = 0;
+            true
+        }
+        Ok(Transcription::Cancelled) => false,
+        Err(e) => {
+            log_error!("Transcription error: {}", e);
+            false
+        }
     }
-
-    output
 }